@@ -0,0 +1,61 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from blog.schedule import seconds_until_next_publication
+
+POST_CARD_VERSION_KEY = 'blog:post_card_version'
+LISTING_VERSION_KEY = 'blog:listing_version'
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        version = bump_version(key)
+    return version
+
+
+def bump_version(key):
+    # Метка времени, а не счётчик: если ключ вытеснят из кэша,
+    # новая версия всё равно не совпадёт ни с одной из прежних.
+    version = time.time_ns()
+    cache.set(key, version, None)
+    return version
+
+
+def get_post_card_version():
+    """Текущая версия закэшированных карточек публикаций."""
+    return get_version(POST_CARD_VERSION_KEY)
+
+
+def bump_post_card_version():
+    return bump_version(POST_CARD_VERSION_KEY)
+
+
+def get_listing_version():
+    """Версия состава лент: меняется при изменении публикаций и категорий."""
+    return get_version(LISTING_VERSION_KEY)
+
+
+def bump_listing_version():
+    return bump_version(LISTING_VERSION_KEY)
+
+
+def listing_count_key(scope):
+    scope_hash = hashlib.md5(repr(sorted(scope.items())).encode()).hexdigest()
+    return (
+        f'blog:listing_count:{get_listing_version()}:'
+        f'{scope_hash}'
+    )
+
+
+def listing_count_timeout(scope):
+    """Число публикаций ленты меняется с выходом отложенной публикации."""
+    timeout = settings.BLOG_LISTING_COUNT_CACHE_TIMEOUT
+    seconds = seconds_until_next_publication(**scope)
+    if seconds is not None:
+        timeout = min(timeout, math.ceil(seconds))
+    return timeout
@@ -0,0 +1,81 @@
+import json
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Category, Comment, Location, Post, Tombstone
+
+# Порядок повторяет зависимости внешних ключей: при загрузке
+# строки ссылаются только на уже выгруженные объекты.
+EXPORT_MODELS = (Category, Location, Post, Comment)
+EXPORT_CHUNK_SIZE = 500
+
+
+def parse_watermark(value):
+    """Отметка времени из запроса; пустое значение — полная выгрузка."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(f'Неверная отметка времени: {value}')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.utc)
+    return moment
+
+
+def dump_line(record):
+    return json.dumps(
+        record, cls=DjangoJSONEncoder, ensure_ascii=False
+    ) + '\n'
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def export_changes(since=None, until=None):
+    """Строки JSON Lines с объектами, изменёнными после since.
+
+    Объекты выводятся в формате dumpdata, удалённые — отметками
+    с "deleted": true. Последняя строка содержит watermark: её значение
+    передаётся в since при следующей выгрузке. Строки читаются из базы
+    курсором пачками по EXPORT_CHUNK_SIZE, а не целиком.
+
+    updated_at выставляется до фиксации транзакции, поэтому строка
+    с отметкой раньше until может стать видимой уже после выгрузки.
+    Watermark отстаёт от until на BLOG_EXPORT_OVERLAP: следующая
+    выгрузка повторно читает это окно и подбирает такие строки,
+    а повторы безопасны — объекты загружаются по первичному ключу.
+    """
+    until = until or timezone.now()
+    watermark = until - timedelta(seconds=settings.BLOG_EXPORT_OVERLAP)
+    for model in EXPORT_MODELS:
+        queryset = model.objects.changed_since(since).filter(
+            updated_at__lte=until
+        )
+        for chunk in chunks(
+            queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+            EXPORT_CHUNK_SIZE
+        ):
+            for record in serializers.serialize('python', chunk):
+                yield dump_line(record)
+    tombstones = Tombstone.objects.filter(deleted_at__lte=until)
+    if since is not None:
+        tombstones = tombstones.filter(deleted_at__gt=since)
+    for tombstone in tombstones.order_by('deleted_at', 'pk').iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    ):
+        yield dump_line({
+            'model': tombstone.model,
+            'pk': tombstone.object_id,
+            'deleted': True,
+            'deleted_at': tombstone.deleted_at,
+        })
+    yield dump_line({'watermark': watermark})
@@ -0,0 +1,198 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Max
+from django.db.models.functions import Greatest
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.defaultfilters import truncatewords
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from blog.cache import get_listing_version
+from blog.models import Category, Post, User
+from blog.schedule import (
+    NO_PUBLICATION, SCHEDULE_CACHE_TIMEOUT, next_publication
+)
+from core.metrics import record_cache
+
+FEED_POST_COUNT = 20
+FEED_DESCRIPTION_WORDS = 50
+
+
+class ConditionalPostFeed(Feed):
+    """Лента публикаций с поддержкой If-None-Match и If-Modified-Since.
+
+    Свежесть ленты определяется датами публикации и изменения по тем же
+    условиям, что и у её страницы, и версией состава лент; даты хранятся
+    в кэше до смены версии или выхода отложенной публикации. Если клиент
+    уже видел эту версию, ответ 304 отдаётся без сборки XML; иначе
+    готовый XML берётся из кэша по ETag.
+    """
+
+    def get_scope(self, obj):
+        return {}
+
+    def get_posts(self, obj):
+        return Post.objects.published().filter(**self.get_scope(obj))
+
+    def get_last_modified(self, obj):
+        scope = self.get_scope(obj)
+        # Отложенная публикация выходит без сохранения моделей и меняет
+        # результат next_publication, а вместе с ним ключ.
+        key = 'blog:feed_last_modified:' + hashlib.md5(repr((
+            get_listing_version(),
+            sorted(scope.items()),
+            next_publication(**scope),
+        )).encode()).hexdigest()
+        last_modified = cache.get(key)
+        if last_modified == NO_PUBLICATION:
+            return None
+        if last_modified is not None:
+            return last_modified
+        # Отложенная публикация выходит позже своего последнего изменения.
+        last_modified = self.get_posts(obj).aggregate(
+            last_modified=Greatest(Max('pub_date'), Max('updated_at'))
+        )['last_modified']
+        cache.set(
+            key, last_modified or NO_PUBLICATION, SCHEDULE_CACHE_TIMEOUT
+        )
+        return last_modified
+
+    def get_freshness(self, obj):
+        last_modified = self.get_last_modified(obj)
+        etag = hashlib.md5(repr((
+            type(self).__name__,
+            sorted(self.get_scope(obj).items()),
+            last_modified,
+            get_listing_version(),
+        )).encode()).hexdigest()
+        return last_modified, quote_etag(etag)
+
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        last_modified, etag = self.get_freshness(obj)
+        timestamp = last_modified and int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is not None:
+            return response
+        key = f'blog:feed:{etag}'
+        cached = cache.get(key)
+        record_cache('feed', cached is not None)
+        if cached is None:
+            feedgen = self.get_feed(obj, request)
+            response = HttpResponse(content_type=feedgen.content_type)
+            feedgen.write(response, 'utf-8')
+            cache.set(
+                key,
+                (response['Content-Type'], response.content),
+                settings.BLOG_FEED_CACHE_TIMEOUT,
+            )
+        else:
+            content_type, content = cached
+            response = HttpResponse(content, content_type=content_type)
+        response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def items(self, obj):
+        return self.get_posts(obj).select_related(
+            'author', 'category'
+        ).order_by('-pub_date')[:FEED_POST_COUNT]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return truncatewords(post.text, FEED_DESCRIPTION_WORDS)
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=[post.id])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_categories(self, post):
+        return [post.category.title] if post.category else []
+
+
+class AtomFeedMixin:
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class LatestPostsFeed(ConditionalPostFeed):
+    """Новые публикации со всего сайта"""
+
+    link = reverse_lazy('blog:index')
+
+    def title(self, obj):
+        return 'Блогикум'
+
+    def description(self, obj):
+        return 'Новые публикации'
+
+
+class CategoryPostsFeed(ConditionalPostFeed):
+    """Новые публикации в категории"""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def get_scope(self, category):
+        return {'category__slug': category.slug}
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=[category.slug])
+
+    def description(self, category):
+        return category.description
+
+
+class AuthorPostsFeed(ConditionalPostFeed):
+    """Новые публикации автора"""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_scope(self, author):
+        return {'author__username': author.username}
+
+    def title(self, author):
+        return f'Блогикум: @{author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=[author.username])
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+
+class LatestPostsAtomFeed(AtomFeedMixin, LatestPostsFeed):
+    pass
+
+
+class CategoryPostsAtomFeed(AtomFeedMixin, CategoryPostsFeed):
+    pass
+
+
+class AuthorPostsAtomFeed(AtomFeedMixin, AuthorPostsFeed):
+    pass
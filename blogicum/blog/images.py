@@ -0,0 +1,111 @@
+import json
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Ширина уменьшенных копий: карточка в ленте занимает 40rem,
+# вторая копия нужна для экранов с двойной плотностью пикселей.
+RENDITION_WIDTHS = (640, 1280)
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpg': ('JPEG', 'image/jpeg'),
+}
+RENDITION_QUALITY = 80
+RENDITIONS_DIR = 'renditions'
+
+
+def rendition_name(name, width, extension):
+    # Имя оригинала сохраняется целиком: у photo.jpg и photo.png
+    # копии должны быть разными.
+    path = PurePosixPath(name)
+    return str(
+        path.parent / RENDITIONS_DIR / f'{path.name}_{width}w.{extension}'
+    )
+
+
+def manifest_name(name):
+    path = PurePosixPath(name)
+    return str(path.parent / RENDITIONS_DIR / f'{path.name}.json')
+
+
+def renditions_exist(image):
+    # Список ширин сохраняется и для маленьких оригиналов, у которых
+    # копий нет: иначе их пришлось бы открывать при каждой проверке.
+    return image.storage.exists(manifest_name(image.name))
+
+
+def rendition_widths(image):
+    """Ширины созданных копий: копии шире оригинала не создаются."""
+    try:
+        with image.storage.open(manifest_name(image.name)) as manifest:
+            return json.load(manifest)['widths']
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def make_renditions(image, force=False):
+    """Сохранить рядом с оригиналом уменьшенные копии в WebP и JPEG.
+
+    Возвращает False, если копии уже были или оригинал меньше самой
+    маленькой из них.
+    """
+    if not force and renditions_exist(image):
+        return False
+    image.open('rb')
+    try:
+        original = Image.open(image)
+        original.load()
+    finally:
+        image.close()
+    # Снимки с телефонов хранятся повёрнутыми, поворот задан в EXIF,
+    # который при сохранении копий теряется.
+    original = ImageOps.exif_transpose(original)
+    if original.mode not in ('RGB', 'L'):
+        original = original.convert('RGB')
+    widths = []
+    for width in RENDITION_WIDTHS:
+        names = [
+            rendition_name(image.name, width, extension)
+            for extension in RENDITION_FORMATS
+        ]
+        for name in names:
+            image.storage.delete(name)
+        # Увеличенная копия не даст чёткости, а в srcset её ширина
+        # была бы указана неверно.
+        if width > original.width:
+            continue
+        height = max(1, round(original.height * width / original.width))
+        resized = original.resize(
+            (width, height), Image.Resampling.LANCZOS
+        )
+        for name, (pil_format, _) in zip(
+                names, RENDITION_FORMATS.values()):
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, quality=RENDITION_QUALITY)
+            image.storage.save(name, ContentFile(buffer.getvalue()))
+        widths.append(width)
+    name = manifest_name(image.name)
+    image.storage.delete(name)
+    image.storage.save(
+        name, ContentFile(json.dumps({'widths': widths}).encode())
+    )
+    return bool(widths)
+
+
+def image_sources(image):
+    """Варианты srcset по форматам; пусто, если копий ещё нет."""
+    if not image:
+        return {}
+    widths = rendition_widths(image)
+    if not widths:
+        return {}
+    return {
+        mime_type: ', '.join(
+            f'{image.storage.url(rendition_name(image.name, width, ext))} '
+            f'{width}w'
+            for width in widths
+        )
+        for ext, (_, mime_type) in RENDITION_FORMATS.items()
+    }
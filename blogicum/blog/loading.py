@@ -0,0 +1,109 @@
+import json
+from itertools import groupby
+from json.decoder import WHITESPACE
+
+from django.db import connection
+
+from blog.export import chunks
+
+READ_SIZE = 64 * 1024
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+def skip_separators(buffer, position):
+    while True:
+        position = WHITESPACE.match(buffer, position).end()
+        if buffer[position:position + 1] != ',':
+            return position
+        position += 1
+
+
+def iter_json_array(stream, read_size=READ_SIZE):
+    """Объекты JSON-массива по одному, без чтения файла целиком.
+
+    В памяти держится только непрочитанный остаток последнего блока.
+    """
+    decoder = json.JSONDecoder()
+    buffer = stream.read(read_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Фикстура должна быть JSON-массивом')
+    position = 1
+    eof = False
+    while True:
+        position = skip_separators(buffer, position)
+        char = buffer[position:position + 1]
+        if char == ']':
+            return
+        if char:
+            try:
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield record
+                continue
+        if eof:
+            raise ValueError('Фикстура обрывается до конца массива')
+        chunk = stream.read(read_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_json_lines(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_fixture(path):
+    """Записи фикстуры в формате dumpdata: JSON-массив или JSON Lines.
+
+    Строки без полей объекта (отметки watermark и удаления из
+    export_changes) пропускаются.
+    """
+    with open(path, encoding='utf-8') as stream:
+        if str(path).endswith(JSON_LINES_SUFFIXES):
+            records = iter_json_lines(stream)
+        else:
+            records = iter_json_array(stream)
+        for record in records:
+            if 'fields' in record:
+                yield record
+
+
+def model_batches(objects, batch_size):
+    """Пачки десериализованных объектов одной модели подряд."""
+    for model, group in groupby(objects, key=lambda obj: type(obj.object)):
+        for batch in chunks(group, batch_size):
+            yield model, batch
+
+
+def bulk_insert(model, batch, ignore_conflicts=False):
+    """Вставка пачки объектов так же, как их сохраняет loaddata.
+
+    В отличие от bulk_create значения полей auto_now и auto_now_add
+    берутся из фикстуры, а не заменяются текущим временем; текущее
+    время ставится, только если в фикстуре поля нет.
+    """
+    objects = [obj.object for obj in batch]
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not (field.primary_key and any(obj.pk is None for obj in objects))
+    ]
+    for field in fields:
+        if getattr(field, 'auto_now', False) or getattr(
+                field, 'auto_now_add', False):
+            for obj in objects:
+                if getattr(obj, field.attname) is None:
+                    field.pre_save(obj, add=True)
+    size = connection.ops.bulk_batch_size(fields, objects) or len(objects)
+    for part in chunks(objects, size):
+        model._base_manager._insert(
+            part, fields=fields, raw=True, ignore_conflicts=ignore_conflicts
+        )
+    for obj in batch:
+        for accessor, values in (obj.m2m_data or {}).items():
+            getattr(obj.object, accessor).set(values)
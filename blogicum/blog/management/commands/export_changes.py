@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.export import export_changes, parse_watermark
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает в JSON Lines публикации, комментарии, категории '
+        'и местоположения, изменённые после отметки времени.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Отметка watermark из предыдущей выгрузки.'
+        )
+
+    def handle(self, *args, since, **options):
+        try:
+            since = parse_watermark(since)
+        except ValueError as error:
+            raise CommandError(error)
+        for line in export_changes(since):
+            self.stdout.write(line, ending='')
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blog.cache import bump_listing_version, bump_post_card_version
+from blog.synthetic import DatasetBuilder
+from core.cache import bump_page_cache_generation
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт синтетических пользователей, категории, местоположения, '
+        'публикации и комментарии для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument(
+            '--future-share', type=float, default=0.05,
+            help='Доля отложенных публикаций.'
+        )
+        parser.add_argument(
+            '--hidden-share', type=float, default=0.05,
+            help='Доля скрытых публикаций и категорий.'
+        )
+        parser.add_argument(
+            '--comment-skew', type=float, default=1.5,
+            help='Параметр распределения Парето для числа комментариев: '
+                 'чем меньше, тем длиннее хвост.'
+        )
+        parser.add_argument(
+            '--max-comments', type=int, default=500,
+            help='Наибольшее число комментариев у одной публикации.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Одинаковый seed даёт одинаковые данные.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одной вставке.'
+        )
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['categories']) < 1:
+            raise CommandError(
+                'Нужен хотя бы один пользователь и одна категория.'
+            )
+        builder = DatasetBuilder(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            future_share=options['future_share'],
+            hidden_share=options['hidden_share'],
+            comment_skew=options['comment_skew'],
+            max_comments=options['max_comments'],
+        )
+        started = time.monotonic()
+        with transaction.atomic():
+            authors = builder.users(options['users'])
+            categories = builder.categories(options['categories'])
+            locations = builder.locations(options['locations'])
+        rows = len(authors) + len(categories) + len(locations)
+        posts = comments = 0
+        for post_count, comment_count in builder.posts(
+                options['posts'], authors, categories, locations):
+            posts += post_count
+            comments += comment_count
+            if options['verbosity'] > 1:
+                self.stdout.write(
+                    f'Публикаций: {posts}, комментариев: {comments}'
+                )
+        rows += posts + comments
+        bump_page_cache_generation()
+        bump_listing_version()
+        bump_post_card_version()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано строк: {rows} (публикаций: {posts}, '
+            f'комментариев: {comments}) за {elapsed:.1f} с '
+            f'({round(rows / max(elapsed, 1e-6))} в секунду)'
+        ))
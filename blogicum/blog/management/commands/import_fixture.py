@@ -0,0 +1,87 @@
+import time
+
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DatabaseError, IntegrityError, connection, transaction
+
+from blog.cache import bump_listing_version, bump_post_card_version
+from blog.loading import bulk_insert, model_batches, read_fixture
+from blog.models import Comment
+from core.cache import bump_page_cache_generation
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает фикстуру dumpdata (JSON или JSON Lines) '
+        'пачками, не читая файл целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к .json или .jsonl файлу.')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество объектов в одной транзакции.'
+        )
+        parser.add_argument(
+            '--ignore-conflicts',
+            action='store_true',
+            help='Пропускать объекты, которые уже есть в базе данных.'
+        )
+
+    def handle(self, *args, path, batch_size, ignore_conflicts, **options):
+        objects = serializers.deserialize(
+            'python', read_fixture(path), ignorenonexistent=True
+        )
+        models = set()
+        loaded = 0
+        started = time.monotonic()
+        # Как и loaddata, проверяем внешние ключи один раз в конце:
+        # объекты могут ссылаться на строки из следующих пачек.
+        try:
+            with connection.constraint_checks_disabled():
+                for model, batch in model_batches(objects, batch_size):
+                    with transaction.atomic():
+                        bulk_insert(model, batch, ignore_conflicts)
+                    models.add(model)
+                    loaded += len(batch)
+                    if options['verbosity'] > 1:
+                        self.stdout.write(
+                            f'{model._meta.label}: {loaded} '
+                            f'({self.rate(loaded, started)} в секунду)'
+                        )
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+        except (DatabaseError, IntegrityError, ValueError) as error:
+            raise CommandError(
+                f'Загрузка прервана после {loaded} объектов: {error}'
+            )
+        self.reset_sequences(models)
+        if Comment in models:
+            call_command('recount_comments', verbosity=0)
+        bump_page_cache_generation()
+        bump_listing_version()
+        bump_post_card_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {loaded} за '
+            f'{time.monotonic() - started:.1f} с '
+            f'({self.rate(loaded, started)} в секунду)'
+        ))
+
+    @staticmethod
+    def rate(loaded, started):
+        return round(loaded / max(time.monotonic() - started, 1e-6))
+
+    @staticmethod
+    def reset_sequences(models):
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for line in sequence_sql:
+                    cursor.execute(line)
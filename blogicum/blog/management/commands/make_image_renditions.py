@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import make_renditions
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии изображений существующих публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии, даже если они уже есть.'
+        )
+
+    def handle(self, *args, force, **options):
+        created = 0
+        posts = Post.objects.exclude(image='').only('pk', 'image')
+        for post in posts.iterator():
+            try:
+                created += make_renditions(post.image, force=force)
+            except (OSError, ValueError) as error:
+                self.stderr.write(f'Публикация {post.pk}: {error}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Созданы копии для публикаций: {created}')
+        )
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from blog.search import create_post_search_index, drop_post_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_post_search_index, drop_post_search_index
+        ),
+    ]
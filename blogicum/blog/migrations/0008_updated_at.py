@@ -0,0 +1,54 @@
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+from blog.search import create_post_search_index, drop_post_search_index
+
+CHANGE_TRACKED_MODELS = ('Category', 'Comment', 'Location', 'Post')
+
+
+def fill_updated_at(apps, schema_editor):
+    # Для существующих записей момент изменения неизвестен,
+    # ближайшая оценка — момент создания.
+    for model_name in CHANGE_TRACKED_MODELS:
+        apps.get_model('blog', model_name).objects.update(
+            updated_at=F('created_at')
+        )
+
+
+def updated_at_field():
+    return models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        default=django.utils.timezone.now,
+        verbose_name='Изменено',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_search_index'),
+    ]
+
+    operations = [
+        # При откате удаление поля тоже пересобирает таблицу.
+        migrations.RunPython(
+            migrations.RunPython.noop, create_post_search_index
+        ),
+        *(
+            migrations.AddField(
+                model_name=model_name.lower(),
+                name='updated_at',
+                field=updated_at_field(),
+                preserve_default=False,
+            )
+            for model_name in CHANGE_TRACKED_MODELS
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        # Добавление поля пересобирает таблицу blog_post в SQLite
+        # вместе с её триггерами.
+        migrations.RunPython(
+            create_post_search_index, drop_post_search_index
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=64, verbose_name='Модель')),
+                ('object_id', models.BigIntegerField(verbose_name='Идентификатор объекта')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Удалено')),
+            ],
+            options={
+                'verbose_name': 'удалённый объект',
+                'verbose_name_plural': 'Удалённые объекты',
+            },
+        ),
+    ]
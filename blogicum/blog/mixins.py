@@ -1,11 +1,23 @@
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
 from django.utils import timezone
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.shortcuts import get_object_or_404
-from django.db.models import Count
 
 from blog.models import Comment, Post, User
+from core.cache import (AnonymousPageCacheMixin, ConditionalResponseMixin,
+                        get_page_cache_generation, stamp_to_datetime)
+from core.metrics import record_cache
+from blog.cache import get_listing_version, get_post_card_version
 from blog.forms import CommentForm, PostForm
+from blog.paginators import CachedCountPaginator, KeysetPaginator
+from blog.schedule import last_publication, seconds_until_next_publication
+
+COMMENTS_PER_PAGE = 20
 
 
 class PostQuerySetMixin:
@@ -17,25 +29,198 @@ class PostQuerySetMixin:
             'author',
             'location',
             'category'
-        ).filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
-        ).order_by('-pub_date')
+        ).published().order_by('-pub_date')
+
+
+class PublicationPageCacheMixin(AnonymousPageCacheMixin):
+    """Кэш страниц блога, учитывающий отложенные публикации.
+
+    Лента не живёт в кэше дольше момента выхода ближайшей отложенной
+    публикации в ней, иначе та появилась бы с опозданием.
+    """
+
+    def get_publication_scope(self):
+        """Фильтры ленты для blog.schedule или None, если это не лента."""
+        return None
+
+    def get_page_cache_timeout(self):
+        timeout = super().get_page_cache_timeout()
+        scope = self.get_publication_scope()
+        if scope is None:
+            return timeout
+        seconds = seconds_until_next_publication(**scope)
+        if seconds is not None:
+            timeout = min(timeout, math.ceil(seconds))
+        return timeout
+
+
+class PublicationConditionalMixin(ConditionalResponseMixin):
+    """Условные ответы для лент блога.
+
+    Лента меняется, когда выходит публикация, в том числе отложенная,
+    которая появляется без сохранения моделей, и когда меняется версия
+    состава лент. Комментарии и записи в других частях сайта ответ 304
+    не отменяют.
+    """
+
+    def get_last_modified(self):
+        scope = self.get_publication_scope()
+        if scope is None:
+            return super().get_last_modified()
+        last_modified = stamp_to_datetime(get_listing_version())
+        pub_date = last_publication(**scope)
+        if pub_date is not None and pub_date > last_modified:
+            return pub_date
+        return last_modified
+
+    def get_etag_data(self):
+        # Местоположение и имя автора выводятся в карточках, но версию
+        # состава лент не меняют.
+        return (get_post_card_version(),)
+
+
+class PostConditionalMixin(ConditionalResponseMixin):
+    """Условные ответы для страницы публикации.
+
+    Свежесть — самое позднее время изменения публикации, её категории
+    и местоположения; комментарии обновляют время изменения публикации.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        # Поколение берётся до загрузки публикации: если контент
+        # изменится во время отрисовки, запись уйдёт в старое поколение.
+        self.freshness_key = (
+            f'blog:post_freshness:{get_page_cache_generation()}:'
+            f'{kwargs[self.pk_url_kwarg]}'
+        )
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_freshness(self):
+        key = self.freshness_key
+        post = getattr(self, 'object', None)
+        if post is not None:
+            dates = (
+                post.updated_at,
+                post.category and post.category.updated_at,
+                post.location and post.location.updated_at,
+            )
+            author = post.author.username
+        else:
+            # Без загруженной публикации (условный запрос или страница
+            # из кэша) хватает одного запроса по первичному ключу.
+            freshness = cache.get(key)
+            record_cache('post_freshness', freshness is not None)
+            if freshness is not None:
+                return freshness
+            row = Post.objects.filter(
+                pk=self.kwargs[self.pk_url_kwarg]
+            ).values_list(
+                'updated_at', 'category__updated_at', 'location__updated_at',
+                'author__username',
+            ).first()
+            if row is None:
+                return None
+            *dates, author = row
+        freshness = (max(filter(None, dates)), author)
+        cache.set(key, freshness, settings.PAGE_CACHE_TIMEOUT)
+        return freshness
+
+    def get_last_modified(self):
+        freshness = self.get_freshness()
+        return freshness and freshness[0]
+
+    def get_etag_data(self):
+        # У пользователей нет времени изменения, а имя автора на странице.
+        freshness = self.get_freshness()
+        return (freshness and freshness[1],)
+
+
+class PostCardCacheMixin:
+    """Параметры кэша фрагментов includes/post_card.html."""
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post_card_timeout'] = settings.BLOG_POST_CARD_CACHE_TIMEOUT
+        context['post_card_version'] = get_post_card_version()
+        return context
+
+
+class PostPaginationMixin:
+    """Пагинация лент публикаций.
+
+    Курсорная пагинация по ключу (pub_date, id) включается для всего сайта
+    настройкой BLOG_KEYSET_PAGINATION или для отдельного запроса
+    параметром ?cursor=. Ссылки вида ?page=N обслуживает постраничный
+    пагинатор с закэшированным числом публикаций ленты, заданной
+    get_publication_scope().
+    """
+
+    cursor_kwarg = 'cursor'
+    paginator_class = CachedCountPaginator
+    page_range_on_each_side = 2
+    page_range_on_ends = 1
+
+    def use_keyset_pagination(self):
+        if self.cursor_kwarg in self.request.GET:
+            return True
+        return (settings.BLOG_KEYSET_PAGINATION
+                and self.page_kwarg not in self.request.GET)
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super().get_paginator(
+            queryset, per_page, scope=self.get_publication_scope(), **kwargs
+        )
 
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_keyset_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None and not getattr(page, 'is_keyset', False):
+            # Первые и последние страницы и окно вокруг текущей:
+            # число ссылок не зависит от размера ленты.
+            context['page_range'] = page.paginator.get_elided_page_range(
+                page.number,
+                on_each_side=self.page_range_on_each_side,
+                on_ends=self.page_range_on_ends,
+            )
+        return context
+
+
+class SingleObjectCacheMixin:
+    """Загружает объект представления один раз за запрос.
+
+    Проверка автора в dispatch, UpdateView и DeleteView обращаются
+    к get_object независимо друг от друга.
+    """
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object(queryset)
+        return self._object
 
-class CommentMixin:
+
+class AuthorRequiredMixin(SingleObjectCacheMixin):
+    """Изменять объект может только его автор."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.get_object().author_id != request.user.pk:
+            return redirect('blog:post_detail', self.kwargs['post_id'])
+        return super().dispatch(request, *args, **kwargs)
+
+
+class CommentMixin(AuthorRequiredMixin):
 
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', self.get_object().id)
-        return super().dispatch(request, *args, **kwargs)
-
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
@@ -43,71 +228,62 @@ class CommentMixin:
         )
 
 
-class PostMixin:
+class PostMixin(AuthorRequiredMixin):
 
     model = Post
+    queryset = Post.objects.select_related('location')
     form_class = PostForm
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != self.request.user:
-            return redirect('blog:post_detail', self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
 
 class PostDetailMixin:
 
     model = Post
 
     def get_object(self, queryset=None):
-        object = super().get_object(
+        # Видимость проверяется в том же запросе, что и выборка поста:
+        # автор видит свой пост всегда, остальные — только опубликованный.
+        visible = Q(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now(),
+        )
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return get_object_or_404(
             self.model.objects.select_related(
                 'location', 'category', 'author'
-            ),
+            ).filter(visible),
+            pk=self.kwargs['post_id']
         )
-        if object.author != self.request.user:
-            return get_object_or_404(
-                self.model.objects.select_related(
-                    'location', 'category', 'author'
-                ).filter(
-                    pub_date__lte=timezone.now(),
-                    category__is_published=True,
-                    is_published=True
-                ),
-                pk=self.kwargs['post_id']
-            )
-        return object
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.object.comments.select_related(
-                'author'
-            ).order_by('created_at')
-        )
+        context['comments'] = KeysetPaginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_PER_PAGE,
+            field='created_at',
+            descending=False,
+        ).page(self.request.GET.get('cursor'))
         return context
 
 
 class ProfileListMixin:
 
-    def get_queryset(self):
-        self.author = get_object_or_404(User, username=self.kwargs['username'])
+    def get_author(self):
         if self.request.user.username == self.kwargs['username']:
-            return Post.objects.select_related(
-                'location', 'category', 'author'
-            ).filter(
-                author=self.author
-            ).order_by('-pub_date').annotate(
-                comment_count=Count('comments')
-            )
+            return self.request.user
+        return get_object_or_404(User, username=self.kwargs['username'])
 
-        return Post.objects.select_related(
-            'location', 'category', 'author'
-        ).filter(
-            author=self.author,
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True,
-        ).order_by('-pub_date').annotate(comment_count=Count('comments'))
+    def get_queryset(self):
+        self.author = self.get_author()
+        # Публикации через связанный менеджер уже знают своего автора,
+        # поэтому соединять таблицу пользователей не нужно.
+        posts = self.author.posts.select_related(
+            'location', 'category'
+        ).order_by('-pub_date')
+        if self.request.user == self.author:
+            return posts
+        return posts.published()
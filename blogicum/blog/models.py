@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from core.models import PublishedModel
+from core.models import PublishedModel, PublishedQuerySet
 
 
 User = get_user_model()
@@ -52,6 +55,26 @@ class Category(PublishedModel):
         return self.title[:STR_VIEWS_LENGTH]
 
 
+class PostQuerySet(PublishedQuerySet):
+
+    def published(self):
+        """Публикации, которые видны всем посетителям."""
+        return self.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now()
+        )
+
+    def recount_comments(self):
+        """Пересчитать хранимое поле comment_count одним UPDATE."""
+        comments = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(count=Count('pk')).values('count')
+        return self.update(
+            comment_count=Coalesce(Subquery(comments), 0)
+        )
+
+
 class Post(PublishedModel):
 
     title = models.CharField(
@@ -89,11 +112,36 @@ class Post(PublishedModel):
         upload_to='post_images',
         blank=True,
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date', ]
+        # Индексы повторяют условия выборки из PostQuerySetMixin,
+        # CategoryPosts и ProfileListMixin: фильтр + сортировка по дате.
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=Q(is_published=True),
+                name='post_published_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return self.title[:STR_VIEWS_LENGTH]
@@ -119,7 +167,32 @@ class Comment(PublishedModel):
         verbose_name_plural = 'Коментарии'
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return (f'Комментарий {self.author} к посту "{self.post}", '
                 f'текст: {self.text[:COMMENTS_VIEWS_LIMIT]}')
+
+
+class Tombstone(models.Model):
+    """Отметка об удалённом объекте для инкрементальной выгрузки."""
+
+    model = models.CharField(max_length=64, verbose_name='Модель')
+    object_id = models.BigIntegerField(verbose_name='Идентификатор объекта')
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Удалено'
+    )
+
+    class Meta:
+        verbose_name = 'удалённый объект'
+        verbose_name_plural = 'Удалённые объекты'
+
+    def __str__(self) -> str:
+        return f'{self.model} #{self.object_id}'
@@ -0,0 +1,157 @@
+from collections.abc import Sequence
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_str
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from blog.cache import listing_count_key, listing_count_timeout
+from core.metrics import record_cache
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+CURSOR_SEPARATOR = '|'
+
+
+def encode_cursor(direction, value, pk):
+    """Непрозрачный курсор по ключу (дата, id)."""
+    raw = CURSOR_SEPARATOR.join((direction, value.isoformat(), str(pk)))
+    return urlsafe_base64_encode(force_bytes(raw))
+
+
+def decode_cursor(cursor):
+    try:
+        direction, value, pk = force_str(
+            urlsafe_base64_decode(cursor)
+        ).split(CURSOR_SEPARATOR)
+        value = parse_datetime(value)
+        pk = int(pk)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise Http404('Неверный курсор страницы')
+    if value is None or direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+        raise Http404('Неверный курсор страницы')
+    return direction, value, pk
+
+
+class KeysetPage(Sequence):
+    """Страница курсорной пагинации.
+
+    Повторяет интерфейс django.core.paginator.Page в той мере, в какой он
+    нужен шаблонам, но не знает ни номера страницы, ни общего количества.
+    """
+
+    is_keyset = True
+
+    def __init__(self, object_list, has_next, has_previous, field):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self._field = field
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self._field), obj.pk)
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return self._cursor(CURSOR_NEXT, self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return self._cursor(CURSOR_PREVIOUS, self.object_list[0])
+        return None
+
+
+class KeysetPaginator:
+    """Пагинатор по ключу (поле даты, id) без OFFSET и COUNT(*).
+
+    Время выборки любой страницы одинаково: запрос использует условие
+    по ключу последнего показанного объекта вместо смещения.
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date',
+                 descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._fetch(self.queryset, forward=True,
+                               has_previous=False)
+        direction, value, pk = decode_cursor(cursor)
+        forward = direction == CURSOR_NEXT
+        return self._fetch(
+            self.queryset.filter(self._after(value, pk, forward)),
+            forward=forward,
+            has_previous=True,
+        )
+
+    def _after(self, value, pk, forward):
+        lookup = 'lt' if forward == self.descending else 'gt'
+        return (
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        )
+
+    def _ordering(self, forward):
+        prefix = '-' if forward == self.descending else ''
+        return f'{prefix}{self.field}', f'{prefix}pk'
+
+    def _fetch(self, queryset, forward, has_previous):
+        objects = list(
+            queryset.order_by(*self._ordering(forward))[:self.per_page + 1]
+        )
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if forward:
+            return KeysetPage(objects, has_more, has_previous, self.field)
+        return KeysetPage(objects[::-1], True, has_more, self.field)
+
+
+class CachedCountPaginator(Paginator):
+    """Постраничный пагинатор с закэшированным числом публикаций ленты.
+
+    COUNT(*) выполняется один раз после изменения публикаций, а точное
+    число хранится в кэше до следующего изменения: по нему проверяются
+    номера страниц, поэтому обрезать подсчёт нельзя.
+    Без scope пагинатор ведёт себя как обычный.
+    """
+
+    def __init__(self, *args, scope=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scope = scope
+
+    @cached_property
+    def count(self):
+        if self.scope is None:
+            return super().count
+        key = listing_count_key(self.scope)
+        count = cache.get(key)
+        record_cache('listing_count', count is not None)
+        if count is None:
+            count = self.object_list.order_by().count()
+            cache.set(key, count, listing_count_timeout(self.scope))
+        return count
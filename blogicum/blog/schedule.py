@@ -0,0 +1,69 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from blog.models import Post
+from core.cache import get_page_cache_generation
+
+# Расписание зависит от того же поколения, что и кэш страниц:
+# любое изменение публикаций или категорий делает его неактуальным.
+SCHEDULE_CACHE_TIMEOUT = 60 * 60 * 24
+NO_PUBLICATION = 'none'
+
+
+def schedule_cache_key(name, scope, *parts):
+    scope_hash = hashlib.md5(
+        repr((sorted(scope.items()), parts)).encode()
+    ).hexdigest()
+    return f'blog:{name}:{get_page_cache_generation()}:{scope_hash}'
+
+
+def next_publication(**scope):
+    """Момент выхода ближайшей отложенной публикации в ленте.
+
+    Лента задаётся фильтрами scope: пустой — главная страница,
+    category__slug — категория, author__username — профиль автора.
+    """
+    now = timezone.now()
+    key = schedule_cache_key('next_publication', scope)
+    next_pub_date = cache.get(key)
+    if next_pub_date == NO_PUBLICATION:
+        return None
+    if next_pub_date is not None and next_pub_date > now:
+        return next_pub_date
+    next_pub_date = Post.objects.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=now,
+        **scope
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+    cache.set(key, next_pub_date or NO_PUBLICATION, SCHEDULE_CACHE_TIMEOUT)
+    return next_pub_date
+
+
+def last_publication(**scope):
+    """Момент выхода последней из уже видимых публикаций ленты."""
+    # Когда наступает время отложенной публикации, меняется и результат
+    # next_publication, а вместе с ним ключ кэша.
+    key = schedule_cache_key(
+        'last_publication', scope, next_publication(**scope)
+    )
+    pub_date = cache.get(key)
+    if pub_date == NO_PUBLICATION:
+        return None
+    if pub_date is not None:
+        return pub_date
+    pub_date = Post.objects.published().filter(**scope).aggregate(
+        pub_date=Max('pub_date')
+    )['pub_date']
+    cache.set(key, pub_date or NO_PUBLICATION, SCHEDULE_CACHE_TIMEOUT)
+    return pub_date
+
+
+def seconds_until_next_publication(**scope):
+    next_pub_date = next_publication(**scope)
+    if next_pub_date is None:
+        return None
+    return (next_pub_date - timezone.now()).total_seconds()
@@ -0,0 +1,101 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+POST_SEARCH_TABLE = 'blog_post_fts'
+# Совпадение в заголовке весит больше, чем в тексте.
+TITLE_WEIGHT = 5.0
+TEXT_WEIGHT = 1.0
+
+# Внешний индекс FTS5 хранит только токены, сами тексты берутся
+# из blog_post; триггеры поддерживают индекс при любых изменениях,
+# включая bulk_create и QuerySet.update().
+CREATE_POST_SEARCH_INDEX = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {POST_SEARCH_TABLE} USING fts5(
+        title, text,
+        content='blog_post', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {POST_SEARCH_TABLE}_insert
+    AFTER INSERT ON blog_post BEGIN
+        INSERT INTO {POST_SEARCH_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {POST_SEARCH_TABLE}_delete
+    AFTER DELETE ON blog_post BEGIN
+        INSERT INTO
+            {POST_SEARCH_TABLE}({POST_SEARCH_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {POST_SEARCH_TABLE}_update
+    AFTER UPDATE OF title, text ON blog_post BEGIN
+        INSERT INTO
+            {POST_SEARCH_TABLE}({POST_SEARCH_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {POST_SEARCH_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"INSERT INTO {POST_SEARCH_TABLE}({POST_SEARCH_TABLE}) VALUES ('rebuild')",
+)
+DROP_POST_SEARCH_INDEX = (
+    f'DROP TRIGGER IF EXISTS {POST_SEARCH_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {POST_SEARCH_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {POST_SEARCH_TABLE}_update',
+    f'DROP TABLE IF EXISTS {POST_SEARCH_TABLE}',
+)
+
+
+def create_post_search_index(apps, schema_editor):
+    # Пересборка таблицы blog_post в миграциях SQLite удаляет триггеры,
+    # поэтому после таких миграций операцию нужно повторить.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE_POST_SEARCH_INDEX:
+        schema_editor.execute(sql)
+
+
+def drop_post_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_POST_SEARCH_INDEX:
+        schema_editor.execute(sql)
+
+
+def get_search_terms(text):
+    return re.findall(r'\w+', text)
+
+
+def search_posts(queryset, text):
+    """Отфильтровать публикации по запросу и упорядочить по релевантности."""
+    terms = get_search_terms(text)
+    if not terms:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(text__icontains=term)
+        return queryset.filter(condition)
+    # Каждое слово ищется как префикс: «публикац» найдёт «публикация».
+    match = ' '.join(f'"{term}"*' for term in terms)
+    # Индекс присоединяется к публикациям, чтобы MATCH выполнился один
+    # раз: ранг в подзапросе пересчитывал бы поиск для каждой строки.
+    return queryset.extra(
+        select={'rank': (
+            f'bm25({POST_SEARCH_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT})'
+        )},
+        tables=[POST_SEARCH_TABLE],
+        where=[
+            f'{POST_SEARCH_TABLE} MATCH %s',
+            f'{POST_SEARCH_TABLE}.rowid = blog_post.id',
+        ],
+        params=[match],
+    ).order_by('rank', '-pub_date')
@@ -0,0 +1,143 @@
+import logging
+
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blog.cache import bump_listing_version, bump_post_card_version
+from blog.images import make_renditions
+from blog.models import Category, Comment, Location, Post, Tombstone, User
+from core.cache import bump_page_cache_generation
+from core.metrics import model_writes
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1,
+            updated_at=timezone.now()
+        )
+    else:
+        # Правка комментария тоже меняет страницу публикации.
+        Post.objects.filter(pk=instance.post_id).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def invalidate_post_cards(sender, **kwargs):
+    # Комментарии меняют карточку только через comment_count,
+    # который входит в ключ фрагмента. Сохранение автора
+    # обрабатывает invalidate_profile_pages.
+    bump_post_card_version()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=User)
+def invalidate_listings(sender, **kwargs):
+    bump_listing_version()
+
+
+@receiver(pre_save, sender=Post)
+def remember_image_upload(sender, instance, **kwargs):
+    # Новый файл ещё не сохранён в хранилище; у прежнего копии уже есть,
+    # и при редактировании остальных полей его незачем открывать.
+    instance._image_uploaded = (
+        bool(instance.image) and not instance.image._committed
+    )
+
+
+@receiver(post_save, sender=Post)
+def create_image_renditions(sender, instance, **kwargs):
+    if not getattr(instance, '_image_uploaded', False):
+        return
+    instance._image_uploaded = False
+    try:
+        make_renditions(instance.image, force=True)
+    except (OSError, ValueError) as error:
+        # Без копий страница покажет оригинал; их можно создать позже
+        # командой make_image_renditions.
+        logger.warning(
+            'Не удалось создать копии изображения %s: %s',
+            instance.image.name, error
+        )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def invalidate_pages(sender, **kwargs):
+    bump_page_cache_generation()
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_pages(sender, update_fields=None, **kwargs):
+    # Вход на сайт обновляет только last_login, на страницах его нет.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_page_cache_generation()
+    bump_listing_version()
+    # В карточке выводится имя автора.
+    bump_post_card_version()
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        model=sender._meta.label_lower, object_id=instance.pk
+    )
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def touch_orphaned_posts(sender, instance, **kwargs):
+    # SET_NULL обнуляет связь через QuerySet.update() без auto_now,
+    # а выгрузка должна увидеть изменённые публикации.
+    instance.posts.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def count_saves(sender, created, **kwargs):
+    model_writes.inc(
+        model=sender._meta.label_lower,
+        action='created' if created else 'updated'
+    )
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def count_deletes(sender, **kwargs):
+    model_writes.inc(model=sender._meta.label_lower, action='deleted')
@@ -0,0 +1,153 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from blog.models import Category, Comment, Location, Post, User
+
+# Тексты берутся из заранее сгенерированных наборов: вызов Faker
+# на каждую из миллионов строк занимает больше времени, чем вставка.
+TEXT_POOL_SIZE = 500
+SYNTHETIC_PASSWORD = 'synthetic'
+PAST_DAYS = 730
+FUTURE_DAYS = 30
+
+
+def new_pks(model, last_pk):
+    # bulk_create в SQLite не возвращает первичные ключи.
+    return list(
+        model.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+            'pk', flat=True
+        )
+    )
+
+
+def last_pk(model):
+    return model.objects.order_by('-pk').values_list(
+        'pk', flat=True
+    ).first() or 0
+
+
+class DatasetBuilder:
+    """Генератор синтетических данных блога, детерминированный по seed.
+
+    Число комментариев у публикаций распределено по Парето: у большинства
+    их почти нет, у немногих — сотни. Часть публикаций отложена или
+    скрыта, чтобы выборки вели себя как на настоящем сайте.
+    """
+
+    def __init__(self, seed=0, batch_size=1000, future_share=0.05,
+                 hidden_share=0.05, comment_skew=1.5, max_comments=500):
+        self.random = random.Random(seed)
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(seed)
+        self.batch_size = batch_size
+        self.future_share = future_share
+        self.hidden_share = hidden_share
+        self.comment_skew = comment_skew
+        self.max_comments = max_comments
+        self.now = timezone.now()
+        self.titles = [
+            self.faker.sentence(nb_words=5)[:-1]
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.texts = [self.faker.text() for _ in range(TEXT_POOL_SIZE)]
+        self.comments = [
+            self.faker.sentence() for _ in range(TEXT_POOL_SIZE)
+        ]
+
+    def create(self, model, objects):
+        start = last_pk(model)
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        return new_pks(model, start)
+
+    def users(self, count):
+        password = make_password(SYNTHETIC_PASSWORD)
+        # Суффикс от последнего ключа позволяет запускать генерацию
+        # поверх уже созданных данных.
+        start = last_pk(User)
+        return self.create(User, [
+            User(
+                username=f'{self.faker.user_name()}_{start + index}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                email=self.faker.email(),
+                password=password,
+            )
+            for index in range(count)
+        ])
+
+    def categories(self, count):
+        start = last_pk(Category)
+        return self.create(Category, [
+            Category(
+                title=self.faker.word().capitalize(),
+                description=self.faker.paragraph(),
+                slug=f'{self.faker.slug()}-{start + index}',
+                is_published=self.random.random() >= self.hidden_share,
+            )
+            for index in range(count)
+        ])
+
+    def locations(self, count):
+        return self.create(Location, [
+            Location(name=self.faker.city()) for _ in range(count)
+        ])
+
+    def comment_count(self):
+        count = int(self.random.paretovariate(self.comment_skew)) - 1
+        return min(count, self.max_comments)
+
+    def pub_date(self):
+        if self.random.random() < self.future_share:
+            days = self.random.uniform(0, FUTURE_DAYS)
+        else:
+            days = -self.random.uniform(0, PAST_DAYS)
+        return self.now + timedelta(days=days)
+
+    def post(self, authors, categories, locations):
+        return Post(
+            title=self.random.choice(self.titles),
+            text=self.random.choice(self.texts),
+            pub_date=self.pub_date(),
+            author_id=self.random.choice(authors),
+            category_id=self.random.choice(categories),
+            location_id=(
+                self.random.choice(locations)
+                if locations and self.random.random() < 0.5 else None
+            ),
+            is_published=self.random.random() >= self.hidden_share,
+            comment_count=self.comment_count(),
+        )
+
+    def posts(self, count, authors, categories, locations):
+        """Публикации и их комментарии пачками по batch_size.
+
+        Возвращает итератор по числу созданных строк после каждой пачки.
+        """
+        created = 0
+        while created < count:
+            size = min(self.batch_size, count - created)
+            posts = [
+                self.post(authors, categories, locations)
+                for _ in range(size)
+            ]
+            with transaction.atomic():
+                pks = self.create(Post, posts)
+                comments = [
+                    Comment(
+                        post_id=pk,
+                        author_id=self.random.choice(authors),
+                        text=self.random.choice(self.comments),
+                    )
+                    for pk, post in zip(pks, posts)
+                    for _ in range(post.comment_count)
+                ]
+                Comment.objects.bulk_create(
+                    comments, batch_size=self.batch_size
+                )
+            created += size
+            yield size, len(comments)
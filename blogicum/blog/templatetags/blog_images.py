@@ -0,0 +1,16 @@
+from django import template
+
+from blog.images import image_sources
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(image, sizes='40rem'):
+    sources = image_sources(image)
+    return {
+        'image': image,
+        'sizes': sizes,
+        'webp_srcset': sources.get('image/webp'),
+        'jpeg_srcset': sources.get('image/jpeg'),
+    }
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 
@@ -15,6 +15,26 @@ urlpatterns = [
         views.ProfileList.as_view(),
         name='profile'
     ),
+    path(
+        'category/<slug:category_slug>/feed/rss/',
+        feeds.CategoryPostsFeed(),
+        name='category_feed'
+    ),
+    path(
+        'category/<slug:category_slug>/feed/atom/',
+        feeds.CategoryPostsAtomFeed(),
+        name='category_atom_feed'
+    ),
+    path(
+        'profile/<str:username>/feed/rss/',
+        feeds.AuthorPostsFeed(),
+        name='profile_feed'
+    ),
+    path(
+        'profile/<str:username>/feed/atom/',
+        feeds.AuthorPostsAtomFeed(),
+        name='profile_atom_feed'
+    ),
     path(
         'edit_profile/',
         views.ProfileUpdate.as_view(),
@@ -25,6 +45,11 @@ urlpatterns = [
         views.PostDetail.as_view(),
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.PostComments.as_view(),
+        name='post_comments'
+    ),
     path(
         'posts/create/',
         views.PostCreate.as_view(),
@@ -55,6 +80,26 @@ urlpatterns = [
         views.CommentDelete.as_view(),
         name='delete_comment'
     ),
+    path(
+        'feed/rss/',
+        feeds.LatestPostsFeed(),
+        name='feed'
+    ),
+    path(
+        'feed/atom/',
+        feeds.LatestPostsAtomFeed(),
+        name='atom_feed'
+    ),
+    path(
+        'export/changes/',
+        views.ChangesExport.as_view(),
+        name='export_changes'
+    ),
+    path(
+        'search/',
+        views.Search.as_view(),
+        name='search'
+    ),
     path(
         '',
         views.Index.as_view(),
@@ -1,35 +1,43 @@
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.http.response import HttpResponseRedirect
+from urllib.parse import urlencode
+
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http.response import (
+    HttpResponseBadRequest, HttpResponseRedirect, StreamingHttpResponse
+)
 from django.shortcuts import get_object_or_404
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
 from django.views.generic import (
-    CreateView, DeleteView, DetailView, ListView, UpdateView
+    CreateView, DeleteView, DetailView, ListView, UpdateView, View
 )
 
 from blog.models import Category, Comment, Post, User
-from blog.mixins import (CommentMixin, PostMixin,
-                         PostQuerySetMixin,
-                         PostDetailMixin, ProfileListMixin)
+from blog.mixins import (CommentMixin, PostMixin, PostPaginationMixin,
+                         PostCardCacheMixin, PostConditionalMixin,
+                         PostQuerySetMixin, PostDetailMixin, ProfileListMixin,
+                         PublicationConditionalMixin,
+                         PublicationPageCacheMixin)
+from blog.export import export_changes, parse_watermark
 from blog.forms import CommentForm, PostForm, ProfileForm
+from blog.search import search_posts
 
 
 INDEX_POST_COUNT = 10
 
 
-class Index(PostQuerySetMixin, ListView):
+class Index(PublicationConditionalMixin, PublicationPageCacheMixin,
+            PostCardCacheMixin, PostPaginationMixin, PostQuerySetMixin,
+            ListView):
     """Главная страница"""
 
     paginate_by = INDEX_POST_COUNT
     template_name = 'blog/index.html'
 
-    def get_queryset(self):
-        return super().get_queryset().annotate(
-            comment_count=Count('comments')).order_by('-pub_date')
+    def get_publication_scope(self):
+        return {}
 
 
-class PostDetail(PostDetailMixin, DetailView):
+class PostDetail(PostConditionalMixin, PublicationPageCacheMixin,
+                 PostDetailMixin, DetailView):
     """Страница отдельного поста"""
 
     model = Post
@@ -43,7 +51,16 @@ class PostDetail(PostDetailMixin, DetailView):
         )
 
 
-class CategoryPosts(PostQuerySetMixin, ListView):
+class PostComments(PostDetailMixin, DetailView):
+    """Следующая порция комментариев к посту в виде HTML-фрагмента"""
+
+    template_name = 'includes/comments_page.html'
+    pk_url_kwarg = 'post_id'
+
+
+class CategoryPosts(PublicationConditionalMixin, PublicationPageCacheMixin,
+                    PostCardCacheMixin, PostPaginationMixin,
+                    PostQuerySetMixin, ListView):
     """Страница отдельной категории."""
 
     template_name = 'blog/category.html'
@@ -56,20 +73,20 @@ class CategoryPosts(PostQuerySetMixin, ListView):
             slug=self.kwargs['category_slug'],
             is_published=True
         )
-        return super().get_queryset().filter(
-            is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now(),
-            category__slug=self.kwargs['category_slug']
-        )
+        return super().get_queryset().filter(category=self.category)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
         return context
 
+    def get_publication_scope(self):
+        return {'category__slug': self.kwargs['category_slug']}
 
-class ProfileList(ProfileListMixin, PostQuerySetMixin, ListView):
+
+class ProfileList(PublicationConditionalMixin, PublicationPageCacheMixin,
+                  PostCardCacheMixin, PostPaginationMixin, ProfileListMixin,
+                  PostQuerySetMixin, ListView):
     """Страница профиля пользователя"""
 
     model = Post
@@ -78,13 +95,46 @@ class ProfileList(ProfileListMixin, PostQuerySetMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = User.objects.get(username=self.kwargs['username'])
+        context['profile'] = self.author
         return context
 
+    def get_publication_scope(self):
+        if self.request.user.username == self.kwargs['username']:
+            # Автор видит и скрытые, и отложенные публикации.
+            return None
+        return {'author__username': self.kwargs['username']}
+
     def get_object(self, queryset=None):
         return get_object_or_404(self.model, pk=self.kwargs[self.pk_url_kwarg])
 
 
+class Search(PostCardCacheMixin, PostPaginationMixin, PostQuerySetMixin,
+             ListView):
+    """Поиск по заголовкам и текстам публикаций"""
+
+    template_name = 'blog/search.html'
+    paginate_by = INDEX_POST_COUNT
+
+    def get_search_text(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search_posts(super().get_queryset(), self.get_search_text())
+
+    def use_keyset_pagination(self):
+        # Результаты упорядочены по релевантности, а не по дате.
+        return False
+
+    def get_publication_scope(self):
+        return None
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['q'] = self.get_search_text()
+        context['page_query'] = urlencode({'q': context['q']}) + '&'
+        return context
+
+
 class ProfileUpdate(LoginRequiredMixin, UpdateView):
     """редактирование страницы профиля пользователя"""
 
@@ -133,9 +183,6 @@ class PostUpdate(LoginRequiredMixin, PostMixin, UpdateView):
         return HttpResponseRedirect(reverse_lazy('blog:post_detail',
                                                  args=[post.pk]))
 
-    def get_object(self, queryset=None):
-        return get_object_or_404(self.model, pk=self.kwargs[self.pk_url_kwarg])
-
     def get_success_url(self):
         return reverse('blog:post_detail', args=[self.object.pk])
 
@@ -181,3 +228,19 @@ class CommentDelete(LoginRequiredMixin, CommentMixin, DeleteView,):
     """Удаление коментария"""
 
     pass
+
+
+class ChangesExport(UserPassesTestMixin, View):
+    """Инкрементальная выгрузка изменений для сотрудников."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        try:
+            since = parse_watermark(request.GET.get('since'))
+        except ValueError as error:
+            return HttpResponseBadRequest(str(error))
+        return StreamingHttpResponse(
+            export_changes(since), content_type='application/x-ndjson'
+        )
@@ -10,11 +10,19 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import hashlib
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Служебные файлы (кэш, журналы) хранятся вне дерева исходников
+# во временном каталоге; метка копии проекта в имени разводит
+# установки на одной машине
+CHECKOUT_ID = hashlib.md5(bytes(BASE_DIR)).hexdigest()[:12]
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
@@ -46,6 +54,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.profiling.ProfilingMiddleware',
+    'core.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -88,6 +99,49 @@ DATABASES = {
     }
 }
 
+# Настройки каждого соединения SQLite. В режиме WAL чтение не ждёт
+# записи, а запись ждёт освобождения базы до busy_timeout миллисекунд
+# вместо ошибки «database is locked»
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение задаёт размер в килобайтах
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/ref/settings/#caches
+
+# Кэш страниц и фрагментов сбрасывается сменой версий, записанных в кэш,
+# поэтому он должен быть общим для всех процессов сервера: в кэше
+# в памяти процесса остальные процессы отдавали бы устаревшие страницы.
+# Файловый кэш общий для процессов одной машины; если серверов
+# несколько, замените его на memcached или redis.
+# Каталог задаётся переменной BLOGICUM_CACHE_DIR; по умолчанию у каждой
+# копии проекта свой каталог, чтобы установки на одной машине не читали
+# фрагменты и версии друг друга
+CACHE_DIR = Path(os.getenv('BLOGICUM_CACHE_DIR') or (
+    Path(tempfile.gettempdir()) / f'blogicum_cache_{CHECKOUT_ID}'
+))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_DIR,
+        'OPTIONS': {
+            # FileBasedCache.set() перечисляет весь каталог, чтобы
+            # проверить лимит: 1000 файлов — около 2 мс на запись,
+            # 10000 — около 30 мс. При переполнении удаляется треть
+            # записей, версии в том числе, что даёт лишь лишние промахи
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -134,3 +188,72 @@ LOGIN_URL = 'login'
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Время жизни страниц в кэше для анонимных посетителей, секунды
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Блог
+
+# Курсорная пагинация лент вместо постраничной (?page=N)
+BLOG_KEYSET_PAGINATION = False
+
+# Время жизни закэшированных карточек публикаций, секунды
+BLOG_POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Время жизни закэшированного числа публикаций в лентах, секунды
+BLOG_LISTING_COUNT_CACHE_TIMEOUT = 60 * 60
+
+# Время жизни готового XML лент RSS и Atom, секунды
+BLOG_FEED_CACHE_TIMEOUT = 60 * 60
+
+# Отставание watermark выгрузки изменений от момента выгрузки, секунды.
+# Должно превышать самую долгую пишущую транзакцию (import_fixture,
+# generate_data), иначе её строки могут не попасть в выгрузку
+BLOG_EXPORT_OVERLAP = 60 * 10
+
+# Профилирование запросов: заголовок Server-Timing и сводка
+# по адресу /profiling/ для сотрудников
+PROFILING_ENABLED = False
+
+# Метрики Prometheus по адресу /metrics/
+METRICS_ENABLED = True
+
+# Адреса сборщика метрик, которым /metrics/ доступен без входа.
+# За обратным прокси на той же машине все запросы приходят
+# с 127.0.0.1, поэтому по умолчанию список пуст
+METRICS_ALLOWED_IPS = []
+
+# Журнал медленных запросов к базе данных в формате JSON Lines;
+# None отключает журнал
+SLOW_QUERY_THRESHOLD_MS = 100
+
+# Путь к журналу задаётся переменной BLOGICUM_SLOW_QUERY_LOG
+SLOW_QUERY_LOG_FILE = Path(os.getenv('BLOGICUM_SLOW_QUERY_LOG') or (
+    Path(tempfile.gettempdir()) / f'blogicum_slow_queries_{CHECKOUT_ID}.jsonl'
+))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'jsonl': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'jsonl',
+        },
+    },
+    'loggers': {
+        'blogicum.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -5,6 +5,8 @@ from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
 from django.urls import include, path, reverse_lazy
 
+from core.views import MetricsView, ProfilingStatsView
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -19,6 +21,12 @@ urlpatterns = [
         name='registration',
     ),
     path('auth/', include('django.contrib.auth.urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path(
+        'profiling/',
+        ProfilingStatsView.as_view(),
+        name='profiling_stats',
+    ),
     path('', include('blog.urls', namespace='blog')),
 ]
 
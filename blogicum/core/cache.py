@@ -0,0 +1,142 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from core.metrics import record_cache
+
+PAGE_CACHE_GENERATION_KEY = 'core:page_cache_generation'
+PAGE_CACHE_METHODS = ('GET', 'HEAD')
+
+
+def get_page_cache_generation():
+    generation = cache.get(PAGE_CACHE_GENERATION_KEY)
+    if generation is None:
+        generation = bump_page_cache_generation()
+    return generation
+
+
+def bump_page_cache_generation():
+    """Сделать недоступными все закэшированные страницы.
+
+    Старые ответы не удаляются, а перестают совпадать по ключу
+    и вытесняются из кэша по истечении срока жизни.
+    """
+    generation = time.time_ns()
+    cache.set(PAGE_CACHE_GENERATION_KEY, generation, None)
+    return generation
+
+
+class AnonymousPageCacheMixin:
+    """Кэш готовых ответов для анонимных посетителей."""
+
+    def get_page_cache_timeout(self):
+        return settings.PAGE_CACHE_TIMEOUT
+
+    def get_page_cache_key(self):
+        url = hashlib.md5(
+            self.request.build_absolute_uri().encode()
+        ).hexdigest()
+        return f'page_cache:{get_page_cache_generation()}:{url}'
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method not in PAGE_CACHE_METHODS
+                or request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+        key = self.get_page_cache_key()
+        response = cache.get(key)
+        record_cache('page', response is not None)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != HTTPStatus.OK:
+            return response
+
+        def store(response):
+            # Страница с CSRF-токеном привязана к cookie посетителя.
+            if request.META.get('CSRF_COOKIE_USED') or response.cookies:
+                return
+            timeout = self.get_page_cache_timeout()
+            if timeout > 0:
+                cache.set(key, response, timeout)
+
+        if getattr(response, 'is_rendered', True):
+            store(response)
+        else:
+            response.add_post_render_callback(store)
+        return response
+
+
+def stamp_to_datetime(stamp):
+    """Время из версии или поколения кэша, записанных в наносекундах."""
+    return datetime.fromtimestamp(stamp / 10 ** 9, tz=timezone.utc)
+
+
+class ConditionalResponseMixin:
+    """Ответ 304 клиентам, у которых уже есть актуальная версия страницы.
+
+    Свежесть определяет get_last_modified(); по умолчанию это время
+    последнего изменения контента, записанное в поколении кэша страниц.
+    """
+
+    def get_last_modified(self):
+        return stamp_to_datetime(get_page_cache_generation())
+
+    def get_etag_data(self):
+        """Состояние страницы, которое не отражается во времени изменения."""
+        return ()
+
+    def get_etag(self, last_modified):
+        # Страница зависит от того, кто её смотрит, и содержит токен CSRF:
+        # после входа он меняется, и старая копия формы получит 403.
+        viewer = (self.request.user.pk
+                  if self.request.user.is_authenticated else None)
+        raw = repr((
+            self.request.get_full_path(),
+            viewer,
+            self.request.META.get('CSRF_COOKIE'),
+            last_modified and last_modified.timestamp(),
+            self.get_etag_data(),
+        ))
+        return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+    def get_validators(self):
+        last_modified = self.get_last_modified()
+        timestamp = last_modified and int(last_modified.timestamp())
+        return self.get_etag(last_modified), timestamp
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in PAGE_CACHE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        # Без условных заголовков свежесть нужна только для ответа,
+        # и её можно взять из уже загруженных для страницы объектов.
+        if ('HTTP_IF_NONE_MATCH' in request.META
+                or 'HTTP_IF_MODIFIED_SINCE' in request.META):
+            etag, timestamp = self.get_validators()
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is not None:
+                return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != HTTPStatus.OK:
+            return response
+
+        def set_validators(response):
+            # Токен CSRF появляется при отрисовке страницы, поэтому ETag
+            # первого ответа считается уже с ним.
+            etag, timestamp = self.get_validators()
+            response['ETag'] = etag
+            if timestamp:
+                response['Last-Modified'] = http_date(timestamp)
+
+        if getattr(response, 'is_rendered', True):
+            set_validators(response)
+        else:
+            response.add_post_render_callback(set_validators)
+        return response
@@ -0,0 +1,248 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core.profiling import RequestProfile, view_label
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class ThreadShards:
+    """Суммы значений по ключам без блокировок на запись.
+
+    Каждый поток пишет в собственный словарь; блокировка берётся только
+    при первой записи потока и при чтении, которое складывает словари
+    всех потоков. Словари завершившихся потоков переносятся в общую
+    сумму, чтобы их число не росло при потоке на каждый запрос.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._base = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def add(self, key, value=1):
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = defaultdict(float)
+            with self._lock:
+                self._fold_finished()
+                self._shards.append((threading.current_thread(), shard))
+        shard[key] += value
+
+    def _fold_finished(self):
+        # Вызывается под блокировкой; завершившийся поток уже ничего
+        # не запишет в свой словарь.
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for key, value in shard.items():
+                    self._base[key] += value
+        self._shards = alive
+
+    def totals(self):
+        with self._lock:
+            self._fold_finished()
+            totals = self._base.copy()
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for key, value in shard.copy().items():
+                totals[key] += value
+        return totals
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = (
+        '{}="{}"'.format(name, str(value).replace('\\', r'\\').replace(
+            '"', r'\"').replace('\n', r'\n'))
+        for name, value in zip(names, values)
+    )
+    return '{' + ','.join(pairs) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values = ThreadShards()
+        registry.append(self)
+
+    def label_values(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} {self.kind}'
+        yield from self.samples()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, value=1, **labels):
+        self.values.add(self.label_values(labels), value)
+
+    def samples(self):
+        for key, value in sorted(self.values.totals().items()):
+            yield (
+                f'{self.name}{format_labels(self.labels, key)} '
+                f'{format_value(value)}'
+            )
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=()):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self.label_values(labels)
+        # Хранится номер корзины, накопленные суммы считаются при выводе.
+        self.values.add((key, bisect_left(self.buckets, value)))
+        self.values.add((key, 'sum'), value)
+
+    def samples(self):
+        series = defaultdict(lambda: {'sum': 0.0, 'buckets': {}})
+        for (key, bucket), value in self.values.totals().items():
+            if bucket == 'sum':
+                series[key]['sum'] = value
+            else:
+                series[key]['buckets'][bucket] = value
+        bucket_labels = self.labels + ('le',)
+        for key, data in sorted(series.items()):
+            cumulative = 0
+            bounds = [format_value(bound) for bound in self.buckets]
+            for index, bound in enumerate(bounds + ['+Inf']):
+                cumulative += data['buckets'].get(index, 0)
+                labels = format_labels(bucket_labels, key + (bound,))
+                yield f'{self.name}_bucket{labels} {format_value(cumulative)}'
+            labels = format_labels(self.labels, key)
+            yield f'{self.name}_sum{labels} {format_value(data["sum"])}'
+            yield f'{self.name}_count{labels} {format_value(cumulative)}'
+
+
+class CacheHitRatio(Metric):
+    """Доля попаданий, вычисляемая из счётчика обращений к кэшу."""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, requests):
+        super().__init__(name, documentation, ('cache',))
+        self.requests = requests
+
+    def samples(self):
+        hits = defaultdict(float)
+        totals = defaultdict(float)
+        for (cache, result), value in self.requests.values.totals().items():
+            totals[cache] += value
+            if result == 'hit':
+                hits[cache] += value
+        for cache, total in sorted(totals.items()):
+            yield (
+                f'{self.name}{format_labels(self.labels, (cache,))} '
+                f'{format_value(round(hits[cache] / total, 4))}'
+            )
+
+
+registry = []
+
+http_requests = Counter(
+    'blogicum_http_requests_total',
+    'Обработанные HTTP-запросы.',
+    ('view', 'method', 'status'),
+)
+http_request_duration = Histogram(
+    'blogicum_http_request_duration_seconds',
+    'Время обработки HTTP-запроса.',
+    ('view',),
+    LATENCY_BUCKETS,
+)
+db_queries = Histogram(
+    'blogicum_db_queries_per_request',
+    'Число запросов к базе данных за HTTP-запрос.',
+    ('view',),
+    QUERY_BUCKETS,
+)
+db_duration = Histogram(
+    'blogicum_db_duration_seconds',
+    'Время запросов к базе данных за HTTP-запрос.',
+    ('view',),
+    LATENCY_BUCKETS,
+)
+cache_requests = Counter(
+    'blogicum_cache_requests_total',
+    'Обращения к кэшу по назначению.',
+    ('cache', 'result'),
+)
+cache_hit_ratio = CacheHitRatio(
+    'blogicum_cache_hit_ratio',
+    'Доля попаданий в кэш с запуска процесса.',
+    cache_requests,
+)
+model_writes = Counter(
+    'blogicum_model_writes_total',
+    'Созданные, изменённые и удалённые объекты.',
+    ('model', 'action'),
+)
+
+
+def record_cache(cache, hit):
+    cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def render_metrics():
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Счётчики запросов для /metrics/, отключаются METRICS_ENABLED."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        view = view_label(request)
+        http_requests.inc(
+            view=view, method=request.method, status=response.status_code
+        )
+        http_request_duration.observe(duration, view=view)
+        db_queries.observe(profile.queries, view=view)
+        db_duration.observe(profile.sql_seconds, view=view)
+        return response
@@ -1,6 +1,20 @@
 from django.db import models
 
 
+class PublishedQuerySet(models.QuerySet):
+
+    def changed_since(self, moment=None):
+        """Объекты, изменённые после moment, в порядке изменения.
+
+        Без moment возвращаются все объекты; порядок (updated_at, id)
+        позволяет продолжать выборку с последнего полученного объекта.
+        """
+        queryset = self
+        if moment is not None:
+            queryset = queryset.filter(updated_at__gt=moment)
+        return queryset.order_by('updated_at', 'pk')
+
+
 class PublishedModel(models.Model):
     is_published = models.BooleanField(
         default=True,
@@ -11,6 +25,13 @@ class PublishedModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_index=True,
+        verbose_name='Изменено'
+    )
+
+    objects = PublishedQuerySet.as_manager()
 
     class Meta:
         abstract = True
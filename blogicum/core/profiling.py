@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+# Профиль запроса, который сейчас обрабатывается в этом потоке.
+current_profile = ContextVar('current_profile', default=None)
+UNKNOWN_TEMPLATE = '<string>'
+# Адреса без маршрута не различаются, чтобы случайные 404
+# не раздували сводку.
+UNRESOLVED_VIEW = '<unresolved>'
+
+
+class RequestProfile:
+    """Запросы к базе данных и время отрисовки шаблонов одного запроса.
+
+    Время шаблона включает вложенные в него include и inclusion-теги.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.templates = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+def view_label(request):
+    match = request.resolver_match
+    return match.view_name if match else UNRESOLVED_VIEW
+
+
+def template_name(template):
+    origin = getattr(template, 'origin', None)
+    return (
+        getattr(origin, 'template_name', None)
+        or template.name
+        or UNKNOWN_TEMPLATE
+    )
+
+
+def install_template_timer():
+    """Засекать время Template._render, как это делает тестовый раннер."""
+    original_render = Template._render
+    if getattr(original_render, 'profiled', False):
+        return
+
+    def _render(template, context):
+        profile = current_profile.get()
+        if profile is None:
+            return original_render(template, context)
+        started = time.perf_counter()
+        try:
+            return original_render(template, context)
+        finally:
+            profile.templates[template_name(template)] += (
+                time.perf_counter() - started
+            )
+
+    _render.profiled = True
+    Template._render = _render
+
+
+class ProfilingStats:
+    """Сводка профилей по именам маршрутов в памяти процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, profile, total_seconds):
+        with self._lock:
+            stats = self._views.setdefault(view_name, {
+                'requests': 0,
+                'total_ms': 0.0,
+                'max_total_ms': 0.0,
+                'sql_ms': 0.0,
+                'queries': 0,
+                'templates_ms': defaultdict(float),
+            })
+            stats['requests'] += 1
+            stats['total_ms'] += total_seconds * 1000
+            stats['max_total_ms'] = max(
+                stats['max_total_ms'], total_seconds * 1000
+            )
+            stats['sql_ms'] += profile.sql_seconds * 1000
+            stats['queries'] += profile.queries
+            for name, seconds in profile.templates.items():
+                stats['templates_ms'][name] += seconds * 1000
+
+    def snapshot(self):
+        """Суммы и средние значения на запрос по каждому маршруту."""
+        with self._lock:
+            result = {}
+            for view_name, stats in self._views.items():
+                requests = stats['requests']
+                result[view_name] = {
+                    'requests': requests,
+                    'avg_total_ms': round(stats['total_ms'] / requests, 3),
+                    'max_total_ms': round(stats['max_total_ms'], 3),
+                    'avg_sql_ms': round(stats['sql_ms'] / requests, 3),
+                    'avg_queries': round(stats['queries'] / requests, 2),
+                    'avg_templates_ms': {
+                        name: round(ms / requests, 3)
+                        for name, ms in sorted(stats['templates_ms'].items())
+                    },
+                }
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+profiling_stats = ProfilingStats()
+
+
+def server_timing(profile, total_seconds):
+    metrics = [
+        f'db;dur={profile.sql_seconds * 1000:.2f};'
+        f'desc="{profile.queries} queries"',
+    ]
+    for index, (name, seconds) in enumerate(
+            sorted(profile.templates.items()), start=1):
+        metrics.append(f'tpl{index};dur={seconds * 1000:.2f};desc="{name}"')
+    metrics.append(f'total;dur={total_seconds * 1000:.2f}')
+    return ', '.join(metrics)
+
+
+class ProfilingMiddleware:
+    """Профилирование запросов, включается настройкой PROFILING_ENABLED.
+
+    Добавляет к ответу заголовок Server-Timing и копит сводку,
+    которую показывает core.views.ProfilingStatsView.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        install_template_timer()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        total_seconds = time.perf_counter() - started
+        profiling_stats.record(view_label(request), profile, total_seconds)
+        response['Server-Timing'] = server_timing(profile, total_seconds)
+        return response
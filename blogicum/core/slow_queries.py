@@ -0,0 +1,130 @@
+import json
+import logging
+import sys
+import time
+import traceback
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+from django.utils import timezone
+
+from core.profiling import template_name, view_label
+
+logger = logging.getLogger('blogicum.slow_queries')
+
+# Обёртки запросов из этих модулей стоят в стеке над любым запросом.
+INSTRUMENTATION_FILES = {
+    str(Path(__file__).resolve().parent / name)
+    for name in ('metrics.py', 'profiling.py', 'slow_queries.py')
+}
+
+
+def params_shape(params, many):
+    """Типы параметров без значений: в них бывают личные данные."""
+    if params is None:
+        return None
+    if many:
+        params = next(iter(params), ())
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+
+def project_frames():
+    """Кадры стека из кода проекта, от внешних к внутренним."""
+    base_dir = str(settings.BASE_DIR)
+    frames = []
+    for frame in traceback.extract_stack():
+        filename = str(Path(frame.filename).resolve())
+        if (not filename.startswith(base_dir)
+                or filename in INSTRUMENTATION_FILES
+                or 'site-packages' in filename):
+            continue
+        frames.append(
+            f'{Path(filename).relative_to(base_dir)}:{frame.lineno} '
+            f'in {frame.name}'
+        )
+    return frames
+
+
+def view_code(request):
+    """Класс или функция представления в виде module.qualname."""
+    match = request.resolver_match
+    if match is None:
+        return None
+    view = getattr(match.func, 'view_class', match.func)
+    return f'{view.__module__}.{view.__qualname__}'
+
+
+def rendering_template():
+    """Шаблон, который отрисовывается сейчас, с учётом include."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        if frame.f_code is Template.render.__code__:
+            return template_name(frame.f_locals['self'])
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLogger:
+    """Обёртка execute_wrapper, записывающая запросы дольше порога."""
+
+    def __init__(self, request, threshold_ms):
+        self.request = request
+        self.threshold_ms = threshold_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.log(sql, params, many, duration_ms, context)
+
+    def log(self, sql, params, many, duration_ms, context):
+        frames = project_frames()
+        template = rendering_template()
+        code = view_code(self.request)
+        logger.warning(json.dumps({
+            'time': timezone.now().isoformat(),
+            'duration_ms': round(duration_ms, 3),
+            'database': context['connection'].alias,
+            'sql': sql,
+            'params': params_shape(params, many),
+            'many': many,
+            'view': view_label(self.request),
+            'method': self.request.method,
+            'path': self.request.path,
+            'view_code': code,
+            'template': template,
+            # Ленивый QuerySet вычисляется в шаблоне, когда представление
+            # уже вернуло ответ, и кода проекта в стеке может не быть:
+            # тогда указывается шаблон или само представление.
+            'origin': frames[-1] if frames else (template or code),
+            'stack': frames,
+        }, ensure_ascii=False))
+
+
+class SlowQueryMiddleware:
+    """Журнал медленных запросов; порог задаёт SLOW_QUERY_THRESHOLD_MS."""
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        slow_query_logger = SlowQueryLogger(
+            request, settings.SLOW_QUERY_THRESHOLD_MS
+        )
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(slow_query_logger)
+                )
+            return self.get_response(request)
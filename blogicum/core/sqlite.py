@@ -0,0 +1,23 @@
+import re
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """Применить SQLITE_PRAGMAS к каждому новому соединению SQLite.
+
+    journal_mode=WAL сохраняется в файле базы данных, остальные
+    настройки действуют только в пределах соединения.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            if not PRAGMA_NAME.match(name):
+                raise ValueError(f'Неверное имя PRAGMA: {name}')
+            cursor.execute(f'PRAGMA {name} = {value}')
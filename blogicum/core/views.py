@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import HttpResponse, JsonResponse
+from django.views.generic import View
+
+from core.metrics import CONTENT_TYPE, render_metrics
+from core.profiling import profiling_stats
+
+
+class ProfilingStatsView(UserPassesTestMixin, View):
+    """Сводка профилирования запросов для сотрудников."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        return JsonResponse(profiling_stats.snapshot())
+
+
+class MetricsView(UserPassesTestMixin, View):
+    """Метрики в текстовом формате Prometheus.
+
+    Доступны с адресов METRICS_ALLOWED_IPS, откуда их забирает
+    сборщик, и сотрудникам.
+    """
+
+    raise_exception = True
+
+    def test_func(self):
+        address = self.request.META.get('REMOTE_ADDR')
+        return (
+            address in settings.METRICS_ALLOWED_IPS
+            or self.request.user.is_staff
+        )
+
+    def get(self, request):
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
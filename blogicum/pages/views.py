@@ -1,12 +1,14 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from core.cache import AnonymousPageCacheMixin
 
-class About(TemplateView):
+
+class About(AnonymousPageCacheMixin, TemplateView):
     template_name = 'pages/about.html'
 
 
-class Rules(TemplateView):
+class Rules(AnonymousPageCacheMixin, TemplateView):
     template_name = 'pages/rules.html'
 
 
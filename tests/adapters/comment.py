@@ -31,7 +31,7 @@ def CommentModelAdapter(CommentModel: type) -> CommentModelAdapterT:
 
         @property
         def _access_by_name_fields(self):
-            return ["id", "refresh_from_db"]
+            return ["id", "refresh_from_db", "updated_at"]
 
         @property
         def AdapterFields(self) -> type:
@@ -0,0 +1,218 @@
+"""Бюджеты запросов и времени ответа для всех адресов блога.
+
+Набор данных создаётся командой generate_data один раз на модуль.
+Число запросов не должно превышать записанное в BASELINE_PATH. Время
+SQL и ответа зависит от загрузки машины, поэтому рост больше чем
+в BENCHMARK_TIME_TOLERANCE раз проверяется только по запросу.
+
+Переменные окружения:
+    BENCHMARK_POSTS — размер набора данных (по умолчанию 2000);
+    BENCHMARK_UPDATE=1 — перезаписать базовую линию замерами;
+    BENCHMARK_ENFORCE_TIME=1 — проверять бюджеты времени;
+    BENCHMARK_TIME_TOLERANCE — допустимый рост времени (по умолчанию 3).
+"""
+import json
+import os
+import time
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.client import Client
+from django.urls import get_resolver, reverse
+
+from blog.models import Category, Comment, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+BENCHMARK_POSTS = int(os.getenv('BENCHMARK_POSTS', 2000))
+BENCHMARK_UPDATE = os.getenv('BENCHMARK_UPDATE') == '1'
+BENCHMARK_ENFORCE_TIME = os.getenv('BENCHMARK_ENFORCE_TIME') == '1'
+TIME_TOLERANCE = float(os.getenv('BENCHMARK_TIME_TOLERANCE', 3))
+# Поправка на дрожание таймера для быстрых страниц, мс.
+TIME_SLACK_MS = 25
+REPEATS = 3
+
+# Аргументы адреса и клиент для каждого маршрута blog и pages;
+# значения берутся из набора данных фикстуры dataset.
+ROUTES = {
+    'blog:index': ({}, 'anonymous'),
+    'blog:category_posts': ({'category_slug': 'category'}, 'anonymous'),
+    'blog:profile': ({'username': 'author'}, 'anonymous'),
+    'blog:category_feed': ({'category_slug': 'category'}, 'anonymous'),
+    'blog:category_atom_feed': (
+        {'category_slug': 'category'}, 'anonymous'
+    ),
+    'blog:profile_feed': ({'username': 'author'}, 'anonymous'),
+    'blog:profile_atom_feed': ({'username': 'author'}, 'anonymous'),
+    'blog:edit_profile': ({}, 'author'),
+    'blog:post_detail': ({'post_id': 'post'}, 'anonymous'),
+    'blog:post_comments': ({'post_id': 'post'}, 'anonymous'),
+    'blog:create_post': ({}, 'author'),
+    'blog:edit_post': ({'post_id': 'post'}, 'author'),
+    'blog:delete_post': ({'post_id': 'post'}, 'author'),
+    'blog:add_comment': ({'post_id': 'post'}, 'author'),
+    'blog:edit_comment': (
+        {'post_id': 'post', 'comment_id': 'comment'}, 'author'
+    ),
+    'blog:delete_comment': (
+        {'post_id': 'post', 'comment_id': 'comment'}, 'author'
+    ),
+    'blog:feed': ({}, 'anonymous'),
+    'blog:atom_feed': ({}, 'anonymous'),
+    'blog:export_changes': ({}, 'staff'),
+    'blog:search': ({}, 'anonymous'),
+    'pages:about': ({}, 'anonymous'),
+    'pages:rules': ({}, 'anonymous'),
+}
+QUERY_STRINGS = {
+    'blog:search': {'q': 'word'},
+    'blog:index': {'page': 5},
+}
+# Маршруты, которые принимают только отправку формы.
+POST_DATA = {
+    'blog:add_comment': {'text': 'Новый комментарий'},
+}
+
+
+@pytest.fixture(scope='module')
+def dataset(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        call_command(
+            'generate_data', '--posts', str(BENCHMARK_POSTS),
+            '--users', '50', '--categories', '10', '--locations', '20',
+            '--seed', '0', stdout=StringIO(),
+        )
+        post = Post.objects.published().order_by(
+            '-comment_count', 'pk'
+        ).first()
+        author = post.author
+        comment = Comment.objects.create(
+            post=post, author=author, text='Комментарий автора'
+        )
+        staff = User.objects.create_user('benchmark_staff', is_staff=True)
+        values = {
+            'post': post.pk,
+            'comment': comment.pk,
+            'author': author.username,
+            'category': Category.objects.get(pk=post.category_id).slug,
+            'word': post.title.split()[0],
+        }
+        clients = {'anonymous': Client(), 'author': Client(),
+                   'staff': Client()}
+        clients['author'].force_login(author)
+        clients['staff'].force_login(staff)
+    yield values, clients
+    with django_db_blocker.unblock():
+        call_command('flush', interactive=False, verbosity=0)
+
+
+def route_names():
+    resolver = get_resolver()
+    names = set()
+    for namespace in ('blog', 'pages'):
+        _, sub_resolver = resolver.namespace_dict[namespace]
+        names |= {
+            f'{namespace}:{name}' for name in sub_resolver.reverse_dict
+            if isinstance(name, str)
+        }
+    return names
+
+
+class QueryTimer:
+    """Обёртка execute_wrapper: число запросов и их суммарное время."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+def measure(client, url, query, data=None):
+    timings = []
+    for _ in range(REPEATS):
+        cache.clear()
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            started = time.perf_counter()
+            if data is None:
+                response = client.get(url, query)
+            else:
+                response = client.post(url, data)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            total_ms = (time.perf_counter() - started) * 1000
+        timings.append((timer.count, timer.seconds * 1000, total_ms))
+    return response, {
+        'queries': timings[0][0],
+        'sql_ms': round(min(timing[1] for timing in timings), 2),
+        'total_ms': round(min(timing[2] for timing in timings), 2),
+    }
+
+
+def load_baseline():
+    if BASELINE_PATH.exists():
+        return json.loads(BASELINE_PATH.read_text(encoding='utf-8'))
+    return {}
+
+
+def test_all_routes_have_benchmarks():
+    missing = route_names() - set(ROUTES)
+    assert not missing, (
+        'Добавьте в ROUTES бюджеты для новых адресов: '
+        f'{", ".join(sorted(missing))}.'
+    )
+
+
+@pytest.mark.parametrize('name', sorted(ROUTES))
+def test_route_budget(dataset, name):
+    values, clients = dataset
+    kwargs, client_name = ROUTES[name]
+    url = reverse(name, kwargs={
+        key: values[value] for key, value in kwargs.items()
+    })
+    query = {
+        key: values.get(value, value)
+        for key, value in QUERY_STRINGS.get(name, {}).items()
+    }
+    response, result = measure(
+        clients[client_name], url, query, POST_DATA.get(name)
+    )
+    assert response.status_code < 500
+    baseline = load_baseline()
+    if BENCHMARK_UPDATE:
+        baseline[name] = result
+        BASELINE_PATH.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + '\n',
+            encoding='utf-8'
+        )
+        return
+    if name not in baseline:
+        pytest.fail(
+            f'Нет базовой линии для {name}: запустите тесты '
+            'с BENCHMARK_UPDATE=1.'
+        )
+    budget = baseline[name]
+    assert result['queries'] <= budget['queries'], (
+        f'{url}: число запросов выросло с {budget["queries"]} '
+        f'до {result["queries"]}.'
+    )
+    if not BENCHMARK_ENFORCE_TIME:
+        return
+    for key in ('sql_ms', 'total_ms'):
+        limit = budget[key] * TIME_TOLERANCE + TIME_SLACK_MS
+        assert result[key] <= limit, (
+            f'{url}: {key} = {result[key]} мс превышает бюджет '
+            f'{limit:.1f} мс.'
+        )
@@ -0,0 +1,41 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_comments(mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что при добавлении комментария увеличивается '
+        'поле `comment_count` публикации.'
+    )
+    comments[0].delete()
+    Comment.objects.filter(pk=comments[1].pk).delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что при удалении комментария уменьшается '
+        'поле `comment_count` публикации.'
+    )
+
+
+def test_comment_count_on_pages(
+        mixer, client, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    for url in ('/', f'/profile/{post.author.username}/',
+                f'/category/{post.category.slug}/'):
+        assert 'Комментарии (2)' in client.get(url).content.decode()
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(4).blend('blog.Comment', post=post)
+    Post.objects.update(comment_count=0)
+    call_command('recount_comments', batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 4
@@ -0,0 +1,137 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def post_url(post):
+    return f'/posts/{post.id}/'
+
+
+@pytest.mark.parametrize('url', ['/', '/category/{slug}/', '/profile/{user}/'])
+def test_listing_not_modified(
+        unlogged_client, post_with_published_location, published_category,
+        user, django_assert_num_queries, url):
+    url = url.format(slug=published_category.slug, user=user.username)
+    response = unlogged_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.has_header('ETag')
+    assert response.has_header('Last-Modified')
+    with django_assert_num_queries(0):
+        response = unlogged_client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что неизменившаяся страница отдаётся ответом 304.'
+    )
+
+
+def test_post_detail_modified_by_comment(
+        mixer, unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    etag = unlogged_client.get(post_url(post))['ETag']
+    response = unlogged_client.get(post_url(post), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    mixer.blend('blog.Comment', post=post)
+    response = unlogged_client.get(post_url(post), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что новый комментарий меняет ETag страницы публикации.'
+    )
+
+
+def test_etag_depends_on_viewer(
+        user_client, another_user_client, post_with_published_location):
+    url = post_url(post_with_published_location)
+    etag = user_client.get(url)['ETag']
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.NOT_MODIFIED
+    )
+    response = another_user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что ETag различается для разных пользователей.'
+    )
+
+
+def test_scheduled_post_modifies_listing(
+        mixer, unlogged_client, user, published_category,
+        post_with_published_location):
+    scheduled = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(minutes=1),
+    )
+    response = unlogged_client.get('/')
+    etag = response['ETag']
+    assert scheduled.title not in response.content.decode()
+    # Момент публикации наступает без сохранения моделей.
+    next_minute = timezone.now() + timedelta(minutes=2)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(timezone, 'now', lambda: next_minute)
+        response = unlogged_client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что выход отложенной публикации меняет ETag ленты.'
+    )
+
+
+def test_etag_changes_after_login(
+        client, user, post_with_published_location):
+    user.set_password('password')
+    user.save()
+    credentials = {'username': user.username, 'password': 'password'}
+    url = post_url(post_with_published_location)
+    client.post('/auth/login/', credentials)
+    etag = client.get(url)['ETag']
+    client.get('/auth/logout/')
+    client.post('/auth/login/', credentials)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что после повторного входа страница с формой '
+        'отдаётся заново: в старой копии устаревший токен CSRF.'
+    )
+
+
+def test_post_detail_ignores_unrelated_writes(
+        mixer, unlogged_client, user, published_category,
+        post_with_published_location):
+    post = post_with_published_location
+    etag = unlogged_client.get(post_url(post))['ETag']
+    other = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=mixer.blend('blog.Location'),
+    )
+    mixer.blend('blog.Comment', post=other)
+    other.location.save()
+    response = unlogged_client.get(post_url(post), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что свежесть страницы публикации не зависит '
+        'от изменений в других частях сайта.'
+    )
+
+
+def test_post_detail_modified_by_comment_edit(
+        mixer, unlogged_client, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post)
+    etag = unlogged_client.get(post_url(post))['ETag']
+    comment.text = 'Исправленный комментарий'
+    comment.save()
+    response = unlogged_client.get(post_url(post), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'Исправленный комментарий' in response.content.decode()
+
+
+def test_listing_ignores_comments_and_follows_locations(
+        mixer, unlogged_client, user, post_with_published_location):
+    post = post_with_published_location
+    etag = unlogged_client.get('/')['ETag']
+    mixer.blend('blog.Comment', post=post, author=user)
+    response = unlogged_client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что комментарии не отменяют ответ 304 для ленты.'
+    )
+    post.location.name = 'Новое место'
+    post.location.save()
+    response = unlogged_client.get('/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
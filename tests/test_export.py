@@ -0,0 +1,144 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog.export import export_changes, parse_watermark
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+EXPORT_URL = '/export/changes/'
+
+
+@pytest.fixture
+def no_overlap():
+    with override_settings(BLOG_EXPORT_OVERLAP=0):
+        yield
+
+
+def read_lines(lines):
+    return [json.loads(line) for line in lines]
+
+
+def exported(records, model):
+    return {
+        record['pk'] for record in records
+        if record.get('model') == model and not record.get('deleted')
+    }
+
+
+def deleted(records, model):
+    return {
+        record['pk'] for record in records
+        if record.get('model') == model and record.get('deleted')
+    }
+
+
+def test_full_export(mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post)
+    records = read_lines(export_changes())
+    assert exported(records, 'blog.post') == {post.pk}
+    assert exported(records, 'blog.comment') == {comment.pk}
+    assert exported(records, 'blog.category') == {post.category_id}
+    assert exported(records, 'blog.location') == {post.location_id}
+    assert 'watermark' in records[-1], (
+        'Убедитесь, что выгрузка заканчивается отметкой времени.'
+    )
+
+
+@pytest.mark.usefixtures('no_overlap')
+def test_incremental_export(mixer, post_with_published_location):
+    post = post_with_published_location
+    watermark = read_lines(export_changes())[-1]['watermark']
+    records = read_lines(export_changes(since=parse_watermark(watermark)))
+    assert records == [{'watermark': records[-1]['watermark']}], (
+        'Убедитесь, что выгрузка без изменений содержит только отметку.'
+    )
+
+    post.title = 'Новый заголовок'
+    post.save()
+    comment = mixer.blend('blog.Comment', post=post)
+    records = read_lines(export_changes(since=parse_watermark(watermark)))
+    assert exported(records, 'blog.post') == {post.pk}
+    assert exported(records, 'blog.comment') == {comment.pk}
+    assert not exported(records, 'blog.category'), (
+        'Убедитесь, что выгружаются только изменённые объекты.'
+    )
+
+
+def test_late_commit_is_exported(post_with_published_location):
+    post = post_with_published_location
+    until = timezone.now()
+    watermark = read_lines(export_changes(until=until))[-1]['watermark']
+    assert parse_watermark(watermark) < until, (
+        'Убедитесь, что watermark отстаёт от момента выгрузки.'
+    )
+    # Строка получила updated_at до выгрузки, а зафиксирована после неё
+    Post.objects.filter(pk=post.pk).update(
+        updated_at=until - timedelta(seconds=1)
+    )
+    records = read_lines(export_changes(since=parse_watermark(watermark)))
+    assert exported(records, 'blog.post') == {post.pk}, (
+        'Убедитесь, что строки, зафиксированные после выгрузки, '
+        'попадают в следующую выгрузку.'
+    )
+
+
+@pytest.mark.usefixtures('no_overlap')
+def test_deletions_are_exported(mixer, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post)
+    watermark = read_lines(export_changes())[-1]['watermark']
+    post_pk, comment_pk = post.pk, comment.pk
+    post.delete()
+    records = read_lines(export_changes(since=parse_watermark(watermark)))
+    assert deleted(records, 'blog.post') == {post_pk}
+    assert deleted(records, 'blog.comment') == {comment_pk}, (
+        'Убедитесь, что удаление объектов попадает в выгрузку.'
+    )
+
+
+@pytest.mark.usefixtures('no_overlap')
+def test_location_delete_touches_posts(post_with_published_location):
+    post = post_with_published_location
+    watermark = read_lines(export_changes())[-1]['watermark']
+    post.location.delete()
+    records = read_lines(export_changes(since=parse_watermark(watermark)))
+    assert exported(records, 'blog.post') == {post.pk}
+    assert deleted(records, 'blog.location') == {post.location_id}
+
+
+@pytest.mark.usefixtures('no_overlap')
+def test_export_view(
+        admin_client, user_client, post_with_published_location):
+    assert user_client.get(EXPORT_URL).status_code == HTTPStatus.FORBIDDEN
+    response = admin_client.get(EXPORT_URL)
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming, 'Убедитесь, что выгрузка отдаётся потоком.'
+    records = read_lines(
+        b''.join(response.streaming_content).decode().splitlines()
+    )
+    watermark = records[-1]['watermark']
+    assert exported(records, 'blog.post') == {
+        post_with_published_location.pk
+    }
+    response = admin_client.get(EXPORT_URL, {'since': watermark})
+    assert len(list(response.streaming_content)) == 1
+    response = admin_client.get(EXPORT_URL, {'since': 'вчера'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_export_command(post_with_published_location):
+    out = StringIO()
+    call_command('export_changes', stdout=out)
+    records = read_lines(out.getvalue().splitlines())
+    assert exported(records, 'blog.post') == {
+        post_with_published_location.pk
+    }
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+FEED_URLS = (
+    '/feed/{kind}/',
+    '/category/{slug}/feed/{kind}/',
+    '/profile/{username}/feed/{kind}/',
+)
+
+
+@pytest.fixture(params=[
+    (url, kind) for url in FEED_URLS for kind in ('rss', 'atom')
+])
+def feed_url(request, post_with_published_location):
+    url, kind = request.param
+    post = post_with_published_location
+    return url.format(
+        kind=kind, slug=post.category.slug, username=post.author.username
+    )
+
+
+def test_feed_lists_posts(
+        client, feed_url, post_with_published_location, future_posts):
+    response = client.get(feed_url)
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode()
+    assert post_with_published_location.title in content
+    for post in future_posts:
+        assert post.title not in content, (
+            'Убедитесь, что в ленту не попадают отложенные публикации.'
+        )
+    assert response['ETag']
+    assert response['Last-Modified']
+
+
+def test_feed_not_modified(
+        client, feed_url, django_assert_max_num_queries):
+    response = client.get(feed_url)
+    # Остаётся только поиск категории или автора ленты.
+    with django_assert_max_num_queries(1):
+        repeated = client.get(
+            feed_url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+    assert not repeated.content
+    repeated = client.get(
+        feed_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_feed_etag_changes_with_posts(
+        client, mixer, feed_url, post_with_published_location):
+    response = client.get(feed_url)
+    post = post_with_published_location
+    post.title = 'Обновлённый заголовок'
+    post.save()
+    repeated = client.get(feed_url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert repeated.status_code == HTTPStatus.OK
+    assert 'Обновлённый заголовок' in repeated.content.decode()
+
+
+def test_unpublished_category_feed(client, mixer):
+    category = mixer.blend('blog.Category', is_published=False)
+    response = client.get(f'/category/{category.slug}/feed/rss/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
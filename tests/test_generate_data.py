@@ -0,0 +1,71 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, F, Max
+from django.utils import timezone
+
+from blog.models import Category, Comment, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+GENERATE_ARGS = ('--users', '5', '--categories', '3', '--locations', '4',
+                 '--posts', '300', '--batch-size', '50')
+
+
+def generate(seed):
+    call_command(
+        'generate_data', *GENERATE_ARGS, '--seed', str(seed),
+        stdout=StringIO(),
+    )
+
+
+def snapshot():
+    return (
+        list(User.objects.order_by('pk').values_list('username', flat=True)),
+        list(Post.objects.order_by('pk').values_list(
+            'title', 'comment_count', 'is_published'
+        )),
+    )
+
+
+def clear():
+    Post.objects.all().delete()
+    User.objects.all().delete()
+    Category.objects.all().delete()
+
+
+def test_generate_data():
+    generate(seed=1)
+    assert User.objects.count() == 5
+    assert Post.objects.count() == 300
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        'Убедитесь, что среди публикаций есть отложенные.'
+    )
+    stats = Post.objects.aggregate(
+        max_comments=Max('comment_count'), comments=Count('comments')
+    )
+    assert stats['comments'] == Comment.objects.count()
+    assert stats['max_comments'] > 3 * stats['comments'] / 300, (
+        'Убедитесь, что число комментариев распределено неравномерно.'
+    )
+    mismatched = Post.objects.annotate(
+        real_count=Count('comments')
+    ).exclude(comment_count=F('real_count'))
+    assert not mismatched.exists(), (
+        'Убедитесь, что comment_count совпадает с числом комментариев.'
+    )
+
+
+def test_generate_data_is_deterministic():
+    generate(seed=7)
+    first = snapshot()
+    clear()
+    generate(seed=7)
+    assert snapshot()[1] == first[1]
+    assert [name.rsplit('_', 1)[0] for name in snapshot()[0]] == [
+        name.rsplit('_', 1)[0] for name in first[0]
+    ], 'Убедитесь, что одинаковый seed даёт одинаковые данные.'
+    clear()
+    generate(seed=8)
+    assert snapshot()[1] != first[1]
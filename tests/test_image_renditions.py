@@ -0,0 +1,177 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from blog.images import (
+    RENDITION_WIDTHS, make_renditions, rendition_name, renditions_exist
+)
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+EXIF_ORIENTATION = 0x0112
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+def make_image_file(size=(2000, 1000), exif=None, color=(73, 109, 137),
+                    name='big_image.jpg'):
+    img_io = BytesIO()
+    image_format = Image.registered_extensions()[PurePosixPath(name).suffix]
+    Image.new('RGB', size, color=color).save(
+        img_io, format=image_format, exif=exif or Image.Exif()
+    )
+    return ImageFile(img_io, name=name)
+
+
+def test_renditions_created_on_upload(
+        media_root, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file(),
+    )
+    for width in RENDITION_WIDTHS:
+        for extension in ('webp', 'jpg'):
+            path = media_root / rendition_name(
+                post.image.name, width, extension
+            )
+            assert path.exists(), (
+                'Убедитесь, что при загрузке изображения создаются '
+                'его уменьшенные копии.'
+            )
+            with Image.open(path) as rendition:
+                assert rendition.width == width
+
+
+def test_renditions_follow_exif_orientation(
+        media_root, mixer, user, published_category):
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file((2000, 1000), exif),
+    )
+    path = media_root / rendition_name(
+        post.image.name, RENDITION_WIDTHS[0], 'jpg'
+    )
+    with Image.open(path) as rendition:
+        assert rendition.height > rendition.width, (
+            'Убедитесь, что копии повёрнуты по тегу Orientation из EXIF.'
+        )
+
+
+def test_small_image_is_not_upscaled(
+        media_root, client, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file((1000, 500)),
+    )
+    for width in RENDITION_WIDTHS:
+        path = media_root / rendition_name(post.image.name, width, 'jpg')
+        assert path.exists() == (width <= 1000), (
+            'Убедитесь, что копии шире оригинала не создаются.'
+        )
+    content = client.get(f'/posts/{post.id}/').content.decode()
+    assert f'{RENDITION_WIDTHS[0]}w' in content
+    assert f'{RENDITION_WIDTHS[-1]}w' not in content, (
+        'Убедитесь, что в srcset нет копий шире оригинала.'
+    )
+
+
+def test_tiny_image_is_processed_once(
+        media_root, monkeypatch, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file((RENDITION_WIDTHS[0] // 2, 100)),
+    )
+    assert renditions_exist(post.image), (
+        'Убедитесь, что результат обработки маленького изображения '
+        'запоминается.'
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError('Оригинал открыт повторно.')
+
+    monkeypatch.setattr(Image, 'open', fail)
+    assert not make_renditions(post.image)
+    post.title = 'Новый заголовок'
+    post.save()
+
+
+def test_post_saves_without_original(
+        media_root, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file(),
+    )
+    (media_root / post.image.name).unlink()
+    post.title = 'Новый заголовок'
+    post.save()
+    broken = ImageFile(BytesIO(b'not an image'), name='broken.jpg')
+    post.image = broken
+    post.save()
+    assert not renditions_exist(post.image), (
+        'Убедитесь, что ошибка обработки изображения не мешает '
+        'сохранить публикацию.'
+    )
+
+
+def test_renditions_of_same_stem_differ(
+        media_root, mixer, user, published_category):
+    posts = [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=make_image_file(color=color, name=name),
+        )
+        for color, name in (((255, 0, 0), 'photo.jpg'),
+                            ((0, 0, 255), 'photo.png'))
+    ]
+    for post, channel in zip(posts, (0, 2)):
+        path = media_root / rendition_name(
+            post.image.name, RENDITION_WIDTHS[0], 'jpg'
+        )
+        with Image.open(path) as rendition:
+            assert rendition.getpixel((0, 0))[channel] > 200, (
+                'Убедитесь, что копии изображений с одинаковым именем, '
+                'но разным расширением не совпадают.'
+            )
+
+
+def test_post_pages_use_srcset(
+        media_root, client, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file(),
+    )
+    webp_url = post.image.storage.url(
+        rendition_name(post.image.name, RENDITION_WIDTHS[0], 'webp')
+    )
+    for url in ('/', f'/posts/{post.id}/'):
+        content = client.get(url).content.decode()
+        assert 'srcset=' in content
+        assert webp_url in content
+        assert post.image.url in content
+
+
+def test_backfill_command(media_root, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=make_image_file(),
+    )
+    renditions = list((media_root / 'post_images' / 'renditions').iterdir())
+    for path in renditions:
+        path.unlink()
+    Post.objects.filter(pk=post.pk).update(image=post.image.name)
+    call_command('make_image_renditions')
+    assert len(
+        list((media_root / 'post_images' / 'renditions').iterdir())
+    ) == len(renditions)
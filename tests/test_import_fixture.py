@@ -0,0 +1,66 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.export import export_changes
+from blog.loading import iter_json_array
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / 'db.json'
+
+
+@pytest.mark.parametrize('read_size', [1, 10, 1024])
+def test_iter_json_array_reads_in_blocks(read_size):
+    expected = json.loads(DB_JSON.read_text(encoding='utf-8'))
+    with DB_JSON.open(encoding='utf-8') as stream:
+        records = list(iter_json_array(stream, read_size=read_size))
+    assert records == expected, (
+        'Убедитесь, что объекты фикстуры читаются по частям без потерь.'
+    )
+
+
+def test_import_db_json():
+    out = StringIO()
+    call_command(
+        'import_fixture', str(DB_JSON), '--batch-size', '5',
+        '--ignore-conflicts', stdout=out,
+    )
+    expected = json.loads(DB_JSON.read_text(encoding='utf-8'))
+    posts = [record for record in expected if record['model'] == 'blog.post']
+    assert Post.objects.count() == len(posts)
+    assert Category.objects.exists() and Location.objects.exists()
+    post = Post.objects.get(pk=posts[0]['pk'])
+    assert post.created_at.isoformat().startswith(
+        posts[0]['fields']['created_at'][:19]
+    ), 'Убедитесь, что даты создания берутся из фикстуры.'
+    assert 'в секунду' in out.getvalue()
+
+
+def test_import_exported_changes(
+        tmp_path, mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    dump = tmp_path / 'changes.jsonl'
+    dump.write_text(''.join(export_changes()), encoding='utf-8')
+    Post.objects.all().delete()
+    Comment.objects.all().delete()
+    call_command('import_fixture', str(dump), '--ignore-conflicts',
+                 stdout=StringIO())
+    post = Post.objects.get(pk=post.pk)
+    assert post.comment_count == 3, (
+        'Убедитесь, что после загрузки комментариев пересчитывается '
+        'comment_count.'
+    )
+
+
+def test_import_broken_fixture(tmp_path):
+    fixture = tmp_path / 'broken.json'
+    fixture.write_text('[{"model": "blog.category", ', encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command('import_fixture', str(fixture), stdout=StringIO())
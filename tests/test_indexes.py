@@ -0,0 +1,61 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import RequestFactory
+
+from blog import views
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='План запроса SQLite'
+    ),
+]
+
+
+def get_view_queryset(view_class, user, **kwargs):
+    request = RequestFactory().get('/')
+    request.user = user
+    view = view_class()
+    view.setup(request, **kwargs)
+    return view.get_queryset()
+
+
+def assert_uses_index(queryset, index_name):
+    plan = queryset.explain()
+    assert index_name in plan, (
+        f'Убедитесь, что запрос использует индекс `{index_name}`, '
+        f'а не полный просмотр таблицы. План:\n{plan}'
+    )
+    assert 'TEMP B-TREE FOR ORDER BY' not in plan, (
+        f'Убедитесь, что сортировку обслуживает индекс. План:\n{plan}'
+    )
+
+
+def test_index_uses_feed_index(user):
+    queryset = get_view_queryset(views.Index, AnonymousUser())
+    assert_uses_index(queryset, 'post_published_feed_idx')
+
+
+def test_category_posts_uses_category_index(published_category):
+    queryset = get_view_queryset(
+        views.CategoryPosts, AnonymousUser(),
+        category_slug=published_category.slug,
+    )
+    assert_uses_index(queryset, 'post_category_feed_idx')
+
+
+@pytest.mark.parametrize('is_owner', [True, False])
+def test_profile_uses_author_index(user, another_user, is_owner):
+    viewer = user if is_owner else another_user
+    queryset = get_view_queryset(
+        views.ProfileList, viewer, username=user.username
+    )
+    assert_uses_index(queryset, 'post_author_feed_idx')
+
+
+def test_post_comments_use_index(post_with_published_location):
+    queryset = post_with_published_location.comments.select_related(
+        'author'
+    ).order_by('created_at')
+    assert_uses_index(queryset, 'comment_post_created_idx')
@@ -0,0 +1,128 @@
+import re
+import threading
+from http import HTTPStatus
+
+import pytest
+from django.test.client import Client
+
+from core.metrics import ThreadShards
+
+pytestmark = [pytest.mark.django_db]
+
+METRICS_URL = '/metrics/'
+
+
+@pytest.fixture(autouse=True)
+def allow_test_client(settings):
+    settings.METRICS_ALLOWED_IPS = ['127.0.0.1']
+
+
+def read_metrics(client):
+    response = client.get(METRICS_URL)
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def sample(samples, name):
+    return samples.get(name, 0)
+
+
+def test_request_metrics(client, post_with_published_location):
+    requests = (
+        'blogicum_http_requests_total'
+        '{view="blog:post_detail",method="GET",status="200"}'
+    )
+    queries = 'blogicum_db_queries_per_request_count{view="blog:post_detail"}'
+    before = read_metrics(client)
+    client.get(f'/posts/{post_with_published_location.id}/')
+    client.get(f'/posts/{post_with_published_location.id}/')
+    after = read_metrics(client)
+    assert sample(after, requests) - sample(before, requests) == 2, (
+        'Убедитесь, что запросы считаются по именам маршрутов.'
+    )
+    assert sample(after, queries) - sample(before, queries) == 2
+    buckets = [
+        name for name in after
+        if name.startswith('blogicum_http_request_duration_seconds_bucket')
+        and 'view="blog:post_detail"' in name
+    ]
+    assert any('le="+Inf"' in name for name in buckets)
+
+
+def test_cache_hit_ratio(client, post_with_published_location):
+    client.get('/')
+    client.get('/')
+    samples = read_metrics(client)
+    assert sample(
+        samples, 'blogicum_cache_requests_total{cache="page",result="hit"}'
+    ) >= 1
+    ratio = sample(samples, 'blogicum_cache_hit_ratio{cache="page"}')
+    assert 0 < ratio < 1
+
+
+def test_model_write_metrics(client, mixer, post_with_published_location):
+    name = 'blogicum_model_writes_total{model="blog.comment",action="%s"}'
+    before = read_metrics(client)
+    comment = mixer.blend('blog.Comment', post=post_with_published_location)
+    comment.delete()
+    after = read_metrics(client)
+    for action in ('created', 'deleted'):
+        assert sample(after, name % action) - sample(
+            before, name % action
+        ) == 1, 'Убедитесь, что записи комментариев считаются.'
+
+
+def test_metrics_access(client, user_client, admin_client, settings):
+    external = Client(REMOTE_ADDR='203.0.113.1')
+    assert external.get(METRICS_URL).status_code == HTTPStatus.FORBIDDEN
+    user_client.defaults['REMOTE_ADDR'] = '203.0.113.1'
+    assert user_client.get(METRICS_URL).status_code == HTTPStatus.FORBIDDEN
+    settings.METRICS_ALLOWED_IPS = []
+    assert client.get(METRICS_URL).status_code == HTTPStatus.FORBIDDEN, (
+        'Убедитесь, что /metrics/ недоступен с адресов, которых нет '
+        'в METRICS_ALLOWED_IPS.'
+    )
+    admin_client.defaults['REMOTE_ADDR'] = '203.0.113.1'
+    assert admin_client.get(METRICS_URL).status_code == HTTPStatus.OK
+
+
+def test_metric_names_are_valid(client):
+    client.get('/')
+    for name in read_metrics(client):
+        assert re.fullmatch(r'[a-zA-Z_:][a-zA-Z0-9_:]*(\{.*\})?', name)
+
+
+def test_thread_shards_are_exact():
+    shards = ThreadShards()
+
+    def work():
+        for _ in range(10000):
+            shards.add('key')
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert shards.totals()['key'] == 80000, (
+        'Убедитесь, что счётчики не теряют значения в нескольких потоках.'
+    )
+
+
+def test_thread_shards_of_finished_threads_are_folded():
+    shards = ThreadShards()
+    for _ in range(200):
+        thread = threading.Thread(target=shards.add, args=('key',))
+        thread.start()
+        thread.join()
+    assert len(shards._shards) <= 1, (
+        'Убедитесь, что словари завершившихся потоков не накапливаются.'
+    )
+    assert shards.totals()['key'] == 200
+    assert not shards._shards
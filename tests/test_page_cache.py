@@ -0,0 +1,146 @@
+import copy
+import os
+import subprocess
+import sys
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.schedule import next_publication
+from blogicum import settings as project_settings
+from core.cache import get_page_cache_generation
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def page_urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        '/',
+        f'/posts/{post.id}/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        '/pages/about/',
+        '/pages/rules/',
+    )
+
+
+def test_anonymous_pages_cached(
+        unlogged_client, page_urls, django_assert_num_queries):
+    for url in page_urls:
+        assert unlogged_client.get(url).status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = unlogged_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+
+def test_logged_in_pages_not_cached(user_client, page_urls):
+    for url in page_urls:
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            user_client.get(url)
+        assert context.captured_queries, (
+            'Убедитесь, что страницы для авторизованных пользователей '
+            'не берутся из кэша.'
+        )
+
+
+@pytest.mark.parametrize('change', ['comment', 'post', 'category'])
+def test_page_cache_invalidated_on_change(
+        unlogged_client, mixer, post_with_published_location, change):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    unlogged_client.get(url)
+    Post.objects.filter(pk=post.pk).update(title='Новый заголовок')
+    if change == 'comment':
+        mixer.blend('blog.Comment', post=post)
+    elif change == 'post':
+        mixer.blend('blog.Post')
+    else:
+        post.category.save()
+    assert 'Новый заголовок' in unlogged_client.get(url).content.decode()
+
+
+def test_page_cache_expires_at_scheduled_publication(
+        unlogged_client, mixer, user, published_category, monkeypatch):
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=90),
+    )
+    timeouts = []
+    monkeypatch.setattr(
+        cache, 'set',
+        lambda key, value, timeout=None: key.startswith('page_cache:')
+        and timeouts.append(timeout)
+    )
+    unlogged_client.get('/')
+    assert timeouts and 0 < timeouts[-1] <= 90, (
+        'Убедитесь, что страница живёт в кэше не дольше, чем до выхода '
+        'ближайшей отложенной публикации.'
+    )
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+
+
+def test_next_publication_per_listing(
+        scheduled_post, another_category, another_user,
+        django_assert_num_queries):
+    assert next_publication() == scheduled_post.pub_date
+    assert next_publication(
+        category__slug=scheduled_post.category.slug
+    ) == scheduled_post.pub_date
+    assert next_publication(
+        author__username=scheduled_post.author.username
+    ) == scheduled_post.pub_date
+    assert next_publication(category__slug=another_category.slug) is None
+    assert next_publication(author__username=another_user.username) is None
+    with django_assert_num_queries(0):
+        next_publication()
+        next_publication(category__slug=another_category.slug)
+
+
+def test_next_publication_follows_changes(scheduled_post):
+    assert next_publication() == scheduled_post.pub_date
+    scheduled_post.is_published = False
+    scheduled_post.save()
+    assert next_publication() is None
+
+
+def test_invalidation_is_shared_between_processes(tmp_path):
+    # Настройки проекта, а не кэш в памяти, которым пользуются тесты;
+    # каталог временный, чтобы не задеть кэш запущенного сервера.
+    caches = copy.deepcopy(project_settings.CACHES)
+    caches['default']['LOCATION'] = tmp_path
+    with override_settings(CACHES=caches):
+        generation = get_page_cache_generation()
+        # Другой процесс сервера меняет контент и сбрасывает кэш страниц.
+        subprocess.run(
+            [sys.executable, '-c', (
+                'import django; django.setup(); '
+                'from core.cache import bump_page_cache_generation; '
+                'bump_page_cache_generation()'
+            )],
+            cwd=settings.BASE_DIR, check=True, env={
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+                'BLOGICUM_CACHE_DIR': str(tmp_path),
+            },
+        )
+        assert get_page_cache_generation() != generation, (
+            'Убедитесь, что кэш общий для всех процессов сервера.'
+        )
@@ -0,0 +1,170 @@
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+N_POSTS = N_PER_PAGE * 2 + 5
+
+
+@pytest.fixture
+def dated_posts(mixer, user, published_category):
+    now = timezone.now()
+    # Две публикации с одинаковой датой проверяют разрешение ничьих по id.
+    dates = [now - timedelta(hours=i // 2) for i in range(N_POSTS)]
+    return mixer.cycle(N_POSTS).blend(
+        'blog.Post',
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(date for date in dates),
+    )
+
+
+def walk_cursor(client, url, key='next_cursor'):
+    response = client.get(url + '?cursor=')
+    pages = [response.context['page_obj']]
+    while getattr(pages[-1], key):
+        response = client.get(f'{url}?cursor={getattr(pages[-1], key)}')
+        assert response.status_code == HTTPStatus.OK
+        pages.append(response.context['page_obj'])
+    return pages
+
+
+@pytest.mark.parametrize('url', ['/', '/category/{slug}/', '/profile/{user}/'])
+def test_keyset_pages_follow_offset_order(
+        client, dated_posts, published_category, user, url):
+    url = url.format(slug=published_category.slug, user=user.username)
+    expected = [
+        post.id for post in sorted(
+            dated_posts, key=lambda post: (post.pub_date, post.id),
+            reverse=True
+        )
+    ]
+    pages = walk_cursor(client, url)
+    assert all(len(page) <= N_PER_PAGE for page in pages)
+    got = [post.id for page in pages for post in page]
+    assert got == expected, (
+        'Убедитесь, что курсорная пагинация выводит все публикации '
+        'в порядке (pub_date, id) без пропусков и повторов.'
+    )
+    assert not pages[0].has_previous()
+    assert not pages[-1].has_next()
+
+    last_page = pages[-1]
+    response = client.get(f'{url}?cursor={last_page.previous_cursor}')
+    assert [post.id for post in response.context['page_obj']] == [
+        post.id for post in pages[-2]
+    ], 'Убедитесь, что ссылка на предыдущую страницу ведёт назад.'
+
+
+def test_keyset_mode_from_settings(client, dated_posts):
+    with override_settings(BLOG_KEYSET_PAGINATION=True):
+        response = client.get('/')
+        page = response.context['page_obj']
+        assert page.is_keyset
+        assert f'?cursor={page.next_cursor}' in response.content.decode()
+        response = client.get('/?page=2')
+        assert not getattr(response.context['page_obj'], 'is_keyset', False)
+
+
+def test_bad_cursor_is_404(client, dated_posts):
+    response = client.get('/?cursor=garbage')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_post_comments_are_paginated(
+        client, mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(45).blend('blog.Comment', post=post)
+    response = client.get(f'/posts/{post.id}/')
+    page = response.context['comments']
+    assert len(page) == 20, (
+        'Убедитесь, что на странице публикации выводится ограниченное '
+        'число комментариев.'
+    )
+    got = [comment.id for comment in page]
+    while page.has_next():
+        url = f'/posts/{post.id}/comments/?cursor={page.next_cursor}'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Оставить комментарий' not in response.content.decode()
+        page = response.context['comments']
+        got += [comment.id for comment in page]
+    assert got == [comment.id for comment in comments], (
+        'Убедитесь, что комментарии подгружаются в порядке создания '
+        'без пропусков и повторов.'
+    )
+
+
+def test_post_comments_respect_visibility(client, mixer, user):
+    post = mixer.blend('blog.Post', author=user, is_published=False)
+    response = client.get(f'/posts/{post.id}/comments/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    return sum(
+        'COUNT(' in query['sql'] for query in context.captured_queries
+    )
+
+
+@pytest.mark.parametrize('url', ['/', '/category/{slug}/', '/profile/{user}/'])
+def test_listing_count_is_cached(
+        another_user_client, mixer, dated_posts, published_category, user,
+        url):
+    url = url.format(slug=published_category.slug, user=user.username)
+    assert count_queries(another_user_client, url) == 1
+    assert count_queries(another_user_client, url + '?page=2') == 0, (
+        'Убедитесь, что число публикаций ленты берётся из кэша.'
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now(),
+    )
+    response = another_user_client.get(url)
+    assert response.context['paginator'].count == N_POSTS + 1
+
+
+def test_last_page_after_cached_count(user_client, dated_posts):
+    last_page = -(-N_POSTS // N_PER_PAGE)
+    user_client.get('/')
+    response = user_client.get(f'/?page={last_page}')
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что последняя страница ленты доступна, когда число '
+        'публикаций взято из кэша.'
+    )
+    assert response.context['paginator'].count == N_POSTS
+    assert len(response.context['page_obj']) == N_POSTS % N_PER_PAGE
+
+
+def test_page_range_is_elided(user_client, user, published_category):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {i}', text='Текст', author=user,
+            category=published_category, pub_date=now - timedelta(hours=i),
+        )
+        for i in range(N_PER_PAGE * 30)
+    )
+    response = user_client.get('/?page=15')
+    content = response.content.decode()
+    page_links = re.findall(r'\?page=(\d+)"', content)
+    assert len(set(page_links)) < 10, (
+        'Убедитесь, что пагинатор выводит ограниченное число ссылок '
+        'на страницы.'
+    )
+    for number in ('1', '13', '14', '16', '17', '30'):
+        assert number in page_links
+    assert '…' in content
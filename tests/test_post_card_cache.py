@@ -0,0 +1,58 @@
+import pytest
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_is_cached(client, mixer, post_with_published_location):
+    post = post_with_published_location
+    assert post.title in client.get('/').content.decode()
+
+    # Обновление в обход сигналов не сбрасывает закэшированную карточку.
+    Post.objects.filter(pk=post.pk).update(title='Скрытое обновление')
+    content = client.get('/').content.decode()
+    assert post.title in content, (
+        'Убедитесь, что карточки публикаций кэшируются.'
+    )
+
+    mixer.blend('blog.Comment', post=post)
+    content = client.get('/').content.decode()
+    assert 'Скрытое обновление' in content
+    assert 'Комментарии (1)' in content, (
+        'Убедитесь, что новый комментарий обновляет карточку публикации.'
+    )
+
+
+@pytest.mark.parametrize('related', ['category', 'location'])
+def test_post_card_invalidated_by_related_change(
+        client, post_with_published_location, related):
+    post = post_with_published_location
+    client.get('/')
+    Post.objects.filter(pk=post.pk).update(title='Новый заголовок')
+    getattr(post, related).save()
+    assert 'Новый заголовок' in client.get('/').content.decode(), (
+        'Убедитесь, что изменение категории или местоположения '
+        'сбрасывает кэш карточек публикаций.'
+    )
+
+
+def test_post_card_invalidated_by_author_rename(
+        client, user, post_with_published_location):
+    client.get('/')
+    user.username = 'renamed_author'
+    user.save()
+    content = client.get('/').content.decode()
+    assert '@renamed_author' in content, (
+        'Убедитесь, что смена имени автора сбрасывает кэш карточек '
+        'публикаций.'
+    )
+
+
+def test_post_card_invalidated_by_post_save(
+        client, post_with_published_location):
+    post = post_with_published_location
+    client.get('/')
+    post.title = 'Отредактированный заголовок'
+    post.save()
+    assert 'Отредактированный заголовок' in client.get('/').content.decode()
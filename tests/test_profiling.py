@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+from django.test.client import Client
+
+from core.profiling import profiling_stats
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def profiled_client():
+    profiling_stats.reset()
+    with override_settings(PROFILING_ENABLED=True):
+        yield Client()
+    profiling_stats.reset()
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+def test_profiling_disabled_by_default(client, post_with_published_location):
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    assert not response.has_header('Server-Timing')
+
+
+def test_server_timing_header(
+        profiled_client, mixer, post_with_published_location):
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    response = profiled_client.get('/')
+    assert response.status_code == HTTPStatus.OK
+    metrics = parse_server_timing(response['Server-Timing'])
+    assert metrics['db']['desc'] != '"0 queries"'
+    templates = {
+        params['desc'].strip('"') for name, params in metrics.items()
+        if name.startswith('tpl')
+    }
+    assert {'blog/index.html', 'includes/post_card.html'} <= templates, (
+        'Убедитесь, что в Server-Timing есть время отрисовки шаблонов.'
+    )
+    assert float(metrics['total']['dur']) >= float(metrics['db']['dur'])
+
+
+def test_profiling_stats_view(
+        profiled_client, admin_client, user_client,
+        post_with_published_location):
+    post_url = f'/posts/{post_with_published_location.id}/'
+    for _ in range(2):
+        profiled_client.get(post_url)
+    assert user_client.get('/profiling/').status_code == HTTPStatus.FORBIDDEN
+    stats = admin_client.get('/profiling/').json()
+    detail = stats['blog:post_detail']
+    assert detail['requests'] == 2
+    assert 'includes/comments.html' in detail['avg_templates_ms'], (
+        'Убедитесь, что сводка собирает время шаблонов по маршрутам.'
+    )
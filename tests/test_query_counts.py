@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+# Сессия и пользователь при авторизованном запросе.
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def post_with_comments(mixer, post_with_published_location):
+    mixer.cycle(3).blend('blog.Comment', post=post_with_published_location)
+    return post_with_published_location
+
+
+@pytest.mark.parametrize(
+    'client_fixture, extra_queries',
+    [('user_client', AUTH_QUERIES),
+     ('another_user_client', AUTH_QUERIES),
+     ('unlogged_client', 0)],
+    ids=['author', 'another user', 'anonymous'],
+)
+def test_post_detail_queries(
+        request, post_with_comments, django_assert_num_queries,
+        client_fixture, extra_queries):
+    client = request.getfixturevalue(client_fixture)
+    # Публикация вместе со связанными объектами и список комментариев.
+    with django_assert_num_queries(2 + extra_queries):
+        response = client.get(f'/posts/{post_with_comments.id}/')
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_hidden_post_detail_single_query(
+        mixer, user, unlogged_client, user_client, published_category,
+        django_assert_num_queries):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=False,
+        category=published_category,
+    )
+    with django_assert_num_queries(1):
+        response = unlogged_client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    with django_assert_num_queries(2 + AUTH_QUERIES):
+        response = user_client.get(f'/posts/{post.id}/')
+    assert response.status_code == HTTPStatus.OK
+
+
+def count_object_fetches(queries, table):
+    return sum(
+        1 for query in queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}" ' in query['sql']
+        and f'WHERE "{table}"."id" = ' in query['sql']
+    )
+
+
+@pytest.mark.parametrize('method', ['get', 'post'])
+@pytest.mark.parametrize('action', ['edit', 'delete'])
+def test_post_owner_views_fetch_post_once(
+        user_client, post_with_published_location, method, action):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/{action}/'
+    data = {
+        'title': 'Новый заголовок',
+        'text': 'Новый текст',
+        'pub_date': post.pub_date.strftime('%Y-%m-%d'),
+        'category': post.category_id,
+    }
+    with CaptureQueriesContext(connection) as context:
+        getattr(user_client, method)(url, data=data)
+    assert count_object_fetches(context.captured_queries, 'blog_post') == 1, (
+        'Убедитесь, что при редактировании и удалении публикации '
+        'она загружается из базы данных один раз.'
+    )
+
+
+@pytest.mark.parametrize('method', ['get', 'post'])
+@pytest.mark.parametrize('action', ['edit_comment', 'delete_comment'])
+def test_comment_owner_views_fetch_comment_once(
+        mixer, user, user_client, post_with_published_location,
+        method, action):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    url = f'/posts/{post.id}/{action}/{comment.id}/'
+    with CaptureQueriesContext(connection) as context:
+        getattr(user_client, method)(url, data={'text': 'Новый текст'})
+    fetches = count_object_fetches(context.captured_queries, 'blog_comment')
+    assert fetches == 1, (
+        'Убедитесь, что при редактировании и удалении комментария '
+        'он загружается из базы данных один раз.'
+    )
+
+
+def test_not_author_redirected_to_post(
+        mixer, another_user_client, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post)
+    response = another_user_client.get(
+        f'/posts/{post.id}/edit_comment/{comment.id}/'
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f'/posts/{post.id}/'
+
+
+@pytest.mark.parametrize(
+    'client_fixture, expected_queries',
+    [
+        # Публикации страницы и их количество для пагинатора.
+        ('user_client', AUTH_QUERIES + 2),
+        # Плюс автор профиля, ближайшая отложенная публикация,
+        # ограничивающая срок жизни закэшированного количества,
+        # и последняя вышедшая публикация для заголовка Last-Modified.
+        ('another_user_client', AUTH_QUERIES + 5),
+        ('unlogged_client', 5),
+    ],
+    ids=['owner', 'another user', 'anonymous'],
+)
+def test_profile_queries(
+        request, user, many_posts_with_published_locations,
+        django_assert_num_queries, client_fixture, expected_queries):
+    client = request.getfixturevalue(client_fixture)
+    with django_assert_num_queries(expected_queries):
+        response = client.get(f'/profile/{user.username}/')
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['profile'] == user
+    assert len(response.context['page_obj']) > 1
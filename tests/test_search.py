@@ -0,0 +1,100 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import search_posts
+
+pytestmark = [pytest.mark.django_db]
+
+# Столько совпадений хватает, чтобы ранжирование с повторным MATCH
+# на каждую строку занимало около секунды.
+N_MATCHING_POSTS = 3000
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    now = timezone.now()
+    return {
+        'title': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=now - timedelta(days=2),
+            title='Путешествие на Байкал', text='Заметки о поездке.',
+        ),
+        'text': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=now - timedelta(days=1),
+            title='Зимние заметки', text='Лёд Байкала прозрачный.',
+        ),
+        'hidden': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=False, title='Байкал', text='Черновик.',
+        ),
+        'future': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=now + timedelta(days=1),
+            title='Байкал летом', text='Скоро.',
+        ),
+        'other': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            pub_date=now, title='Горы', text='Алтай.',
+        ),
+    }
+
+
+def search(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_search_ranks_visible_posts(client, searchable_posts):
+    assert search(client, 'байкал') == [
+        searchable_posts['title'].id, searchable_posts['text'].id
+    ], (
+        'Убедитесь, что поиск находит только опубликованные посты и '
+        'ставит совпадения в заголовке выше совпадений в тексте.'
+    )
+
+
+def test_search_follows_changes(client, searchable_posts):
+    post = searchable_posts['other']
+    Post.objects.filter(pk=post.pk).update(text='Алтай и Байкал')
+    assert post.id in search(client, 'Байкал')
+    post.delete()
+    assert search(client, 'Алтай') == []
+
+
+def test_search_handles_syntax(client, searchable_posts):
+    assert search(client, '') == []
+    assert search(client, '"AND (*') == []
+    assert search(client, 'заметк') == [
+        searchable_posts['text'].id, searchable_posts['title'].id
+    ]
+
+
+def test_search_runs_match_once(user, published_category):
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Заметка {i}', text='Байкал и горы', author=user,
+            category=published_category, pub_date=now - timedelta(hours=i),
+        )
+        for i in range(N_MATCHING_POSTS)
+    )
+    queryset = search_posts(Post.objects.select_related('author'), 'байкал')
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = [row[-1] for row in cursor.fetchall()]
+    assert not any('SUBQUERY' in step for step in plan), (
+        'Убедитесь, что полнотекстовый поиск выполняется один раз, '
+        'а не для каждой найденной публикации.'
+    )
+    started = time.perf_counter()
+    assert len(queryset[:10]) == 10
+    assert time.perf_counter() - started < 0.25
@@ -0,0 +1,77 @@
+import json
+import logging
+
+import pytest
+from django.test import override_settings
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.entries = []
+
+    def emit(self, record):
+        self.entries.append(json.loads(record.getMessage()))
+
+
+@pytest.fixture
+def slow_query_log():
+    handler = ListHandler()
+    logger = logging.getLogger('blogicum.slow_queries')
+    # Файловый журнал на время теста заменяется списком.
+    handlers, logger.handlers = logger.handlers, [handler]
+    yield handler.entries
+    logger.handlers = handlers
+
+
+def test_slow_queries_logged(slow_query_log, post_with_published_location):
+    post = post_with_published_location
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+        Client().get(f'/posts/{post.id}/')
+    assert slow_query_log, 'Убедитесь, что медленные запросы записываются.'
+    entry = slow_query_log[0]
+    assert entry['view'] == 'blog:post_detail'
+    assert entry['path'] == f'/posts/{post.id}/'
+    assert entry['sql'].startswith('SELECT')
+    assert all(isinstance(kind, str) for kind in entry['params']), (
+        'Убедитесь, что в журнал попадают типы параметров, а не значения.'
+    )
+    assert entry['origin'].startswith('blog/mixins.py:'), (
+        'Убедитесь, что в журнале указана строка кода, выполнившая запрос.'
+    )
+
+
+def test_template_queries_are_located(
+        slow_query_log, post_with_published_location):
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+        Client().get('/')
+    listing = [
+        entry for entry in slow_query_log
+        if entry['sql'].startswith('SELECT "blog_post"."id"')
+    ]
+    assert listing
+    for entry in listing:
+        assert entry['view_code'] == 'blog.views.Index'
+        assert entry['template'] == 'blog/index.html'
+        assert entry['origin'], (
+            'Убедитесь, что для запросов из шаблона указаны шаблон '
+            'и представление.'
+        )
+
+
+def test_fast_queries_not_logged(
+        slow_query_log, post_with_published_location):
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=10 ** 6):
+        Client().get(f'/posts/{post_with_published_location.id}/')
+    assert not slow_query_log
+
+
+def test_slow_query_log_disabled(
+        slow_query_log, post_with_published_location):
+    with override_settings(SLOW_QUERY_THRESHOLD_MS=None):
+        Client().get(f'/posts/{post_with_published_location.id}/')
+    assert not slow_query_log
@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+pytestmark = [
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Настройки SQLite'
+    ),
+]
+
+WRITERS = 4
+READERS = 4
+ROWS_PER_WRITER = 50
+# Сколько читатель держит транзакцию, ожидая завершения записи, с.
+READ_TRANSACTION_SECONDS = 2
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+def count_rows(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM comment')
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def connect(tmp_path, django_db_blocker):
+    """Соединения с отдельным файлом базы данных, как в работе сайта."""
+    settings_dict = dict(connections.databases['default'])
+    settings_dict['NAME'] = str(tmp_path / 'concurrency.sqlite3')
+
+    def connect():
+        return DatabaseWrapper(dict(settings_dict), alias='concurrency')
+
+    with django_db_blocker.unblock():
+        wrapper = connect()
+        with wrapper.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE comment (id INTEGER PRIMARY KEY, text TEXT)'
+            )
+        wrapper.close()
+        yield connect
+
+
+def write(connect, number, errors):
+    wrapper = connect()
+    try:
+        for index in range(ROWS_PER_WRITER):
+            with wrapper.cursor() as cursor:
+                cursor.execute(
+                    'INSERT INTO comment (text) VALUES (%s)',
+                    [f'Комментарий {number}-{index}'],
+                )
+    except Exception as error:
+        errors.append(error)
+    finally:
+        wrapper.close()
+
+
+def read(connect, done, errors):
+    wrapper = connect()
+    seen = 0
+    try:
+        while not done.is_set():
+            count = count_rows(wrapper)
+            if count < seen:
+                raise AssertionError(f'Строк стало меньше: {count} < {seen}')
+            seen = count
+    except Exception as error:
+        errors.append(error)
+    finally:
+        wrapper.close()
+
+
+def test_pragmas_applied(connect):
+    wrapper = connect()
+    try:
+        assert pragma(wrapper, 'journal_mode') == 'wal', (
+            'Убедитесь, что база данных SQLite работает в режиме WAL.'
+        )
+        assert pragma(wrapper, 'synchronous') == 1
+        assert pragma(wrapper, 'busy_timeout') == 5000
+        assert pragma(wrapper, 'temp_store') == 2
+        assert pragma(wrapper, 'cache_size') == -64 * 1024
+    finally:
+        wrapper.close()
+
+
+def test_parallel_readers_and_writers(connect):
+    errors = []
+    done = threading.Event()
+    writers = [
+        threading.Thread(target=write, args=(connect, number, errors))
+        for number in range(WRITERS)
+    ]
+    readers = [
+        threading.Thread(target=read, args=(connect, done, errors))
+        for _ in range(READERS)
+    ]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+    assert not errors, (
+        'Убедитесь, что параллельные чтение и запись не приводят '
+        f'к ошибкам: {errors[:3]}'
+    )
+    wrapper = connect()
+    try:
+        assert count_rows(wrapper) == WRITERS * ROWS_PER_WRITER
+    finally:
+        wrapper.close()
+
+
+def test_writer_not_blocked_by_long_read(connect):
+    reading = threading.Event()
+    written = threading.Event()
+    counts = []
+
+    def long_read():
+        wrapper = connect()
+        try:
+            with wrapper.cursor() as cursor:
+                cursor.execute('BEGIN')
+                counts.append(count_rows(wrapper))
+                reading.set()
+                written.wait(READ_TRANSACTION_SECONDS)
+                # Читатель продолжает видеть свой снимок базы.
+                counts.append(count_rows(wrapper))
+                cursor.execute('COMMIT')
+        finally:
+            wrapper.close()
+
+    reader = threading.Thread(target=long_read)
+    reader.start()
+    reading.wait()
+    errors = []
+    write(connect, 0, errors)
+    finished_during_read = reader.is_alive()
+    written.set()
+    reader.join()
+    assert not errors
+    assert finished_during_read, (
+        'Убедитесь, что запись не ждёт завершения долгого чтения.'
+    )
+    assert counts == [0, 0]
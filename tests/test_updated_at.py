@@ -0,0 +1,53 @@
+import pytest
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize('model', [Category, Comment, Location, Post])
+def test_updated_at_field(model):
+    field = model._meta.get_field('updated_at')
+    assert field.auto_now, (
+        f'Убедитесь, что поле `updated_at` модели `{model.__name__}` '
+        'обновляется при каждом сохранении.'
+    )
+    assert field.db_index, (
+        f'Убедитесь, что поле `updated_at` модели `{model.__name__}` '
+        'проиндексировано.'
+    )
+
+
+def test_changed_since(post_with_published_location):
+    post = post_with_published_location
+    since = timezone.now()
+    assert not Post.objects.changed_since(since).exists()
+    post.title = 'Новый заголовок'
+    post.save()
+    assert list(Post.objects.changed_since(since)) == [post], (
+        'Убедитесь, что `changed_since` возвращает изменённые объекты.'
+    )
+    assert post.updated_at > since
+    assert Post.objects.changed_since().count() == Post.objects.count()
+
+
+def test_comment_updates_post(mixer, post_with_published_location):
+    post = post_with_published_location
+    since = timezone.now()
+    mixer.blend('blog.Comment', post=post)
+    assert list(Post.objects.changed_since(since)) == [post], (
+        'Убедитесь, что изменение числа комментариев отмечается '
+        'в `updated_at` публикации.'
+    )
+
+
+def test_changed_since_order(mixer):
+    since = timezone.now()
+    categories = mixer.cycle(3).blend('blog.Category')
+    categories[0].save()
+    changed = list(Category.objects.changed_since(since))
+    assert changed == [categories[1], categories[2], categories[0]], (
+        'Убедитесь, что `changed_since` сортирует объекты '
+        'по времени изменения.'
+    )